@@ -4,11 +4,16 @@ from __future__ import annotations
 
 import ast
 import dataclasses
-import sys
 
 from latexify.ast_utils import make_constant
 from latexify.exceptions import LatexifySyntaxError
 
+# Shared read-only nodes for the "stop - 1" rewrite in reduce_stop_parameter.
+# Codegen never mutates these subtrees, so reusing them is safe.
+_SUB = ast.Sub()
+_CONST_ZERO = make_constant(0)
+_CONST_ONE = make_constant(1)
+
 
 @dataclasses.dataclass(frozen=True, eq=False)
 class RangeInfo:
@@ -35,11 +40,11 @@ def extract_int_or_none(node: ast.expr) -> int | None:
     Returns:
         Extracted int value, or None if extraction failed.
     """
-    if sys.version_info < (3, 8):
-        if isinstance(node, ast.Num) and isinstance(node.n, int) and not isinstance(node.n, bool):
-            return node.n
-    elif isinstance(node, ast.Constant) and isinstance(node.value, int) and not isinstance(node.n, bool):
-        return node.value
+    if type(node) is ast.Constant:
+        value = node.value
+        # bool is a subclass of int and must be excluded.
+        if type(value) is int:
+            return value
 
     return None
 
@@ -62,13 +67,13 @@ def analyze_range(node: ast.Call) -> RangeInfo:
     num_args = len(node.args)
 
     if num_args == 1:
-        start = make_constant(0)
+        start = _CONST_ZERO
         stop = node.args[0]
-        step = make_constant(1)
+        step = _CONST_ONE
     else:
         start = node.args[0]
         stop = node.args[1]
-        step = node.args[2] if num_args == 3 else make_constant(1)
+        step = node.args[2] if num_args == 3 else _CONST_ONE
 
     return RangeInfo(
         start=start,
@@ -80,6 +85,26 @@ def analyze_range(node: ast.Call) -> RangeInfo:
     )
 
 
+def preannotate_ranges(tree: ast.AST) -> None:
+    """Annotates every `range(...)` call in the tree with its RangeInfo.
+
+    The result is stored on the Call node as `_range_info` so that codegen
+    passes visiting the same tree can read it back instead of re-analyzing
+    the subtree.
+
+    Args:
+        tree: Tree to be annotated in place.
+    """
+    for node in ast.walk(tree):
+        if (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Name)
+            and node.func.id == "range"
+            and 1 <= len(node.args) <= 3
+        ):
+            node._range_info = analyze_range(node)
+
+
 def reduce_stop_parameter(node: ast.expr) -> ast.expr:
     """Adjusts the stop expression of the range.
 
@@ -95,17 +120,12 @@ def reduce_stop_parameter(node: ast.expr) -> ast.expr:
         Converted expression.
     """
     if not (isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Add, ast.Sub))):
-        return ast.BinOp(left=node, op=ast.Sub(), right=make_constant(1))
+        return ast.BinOp(left=node, op=_SUB, right=_CONST_ONE)
 
-    # Treatment for Python 3.7.
-    rhs = (
-        ast.Constant(value=node.right.n)
-        if sys.version_info < (3, 8) and isinstance(node.right, ast.Num)
-        else node.right
-    )
+    rhs = node.right
 
     if not isinstance(rhs, ast.Constant):
-        return ast.BinOp(left=node, op=ast.Sub(), right=make_constant(1))
+        return ast.BinOp(left=node, op=_SUB, right=_CONST_ONE)
 
     shift = 1 if isinstance(node.op, ast.Add) else -1
 
@@ -123,19 +143,32 @@ def reduce_stop_parameter(node: ast.expr) -> ast.expr:
 def analyze_attribute(node: ast.Attribute | ast.Name) -> tuple[str, ...]:
     """Helper to obtain nested prefix.
 
+    The parts tuple is memoized on the node, since the same attribute chain
+    is analyzed once per occurrence per codegen pass.
+
     Args:
         node (ast.Attribute | ast.Name): Attribute or name node.
 
     Returns:
         The nested prefix. e.g. ("numpy", "random") for "numpy.random".
     """
-    if isinstance(node, ast.Name):
-        return (node.id,)
+    cached = getattr(node, "_attr_parts", None)
+    if cached is not None:
+        return cached
+
+    attrs: list[str] = []
+    root: ast.expr = node
 
-    if isinstance(node, ast.Attribute):
-        return (*analyze_attribute(node.value), node.attr)
+    while isinstance(root, ast.Attribute):
+        attrs.append(root.attr)
+        root = root.value
 
-    raise LatexifySyntaxError("Unsupported AST for analyze_attribute.")
+    if not isinstance(root, ast.Name):
+        raise LatexifySyntaxError("Unsupported AST for analyze_attribute.")
+
+    parts = (root.id, *reversed(attrs))
+    node._attr_parts = parts
+    return parts
 
 
 def extract_int(node: ast.expr) -> int:
@@ -158,17 +191,31 @@ def extract_int(node: ast.expr) -> int:
     return value
 
 
+_UNSET = object()
+
+
 def extract_function_name_or_none(node: ast.Call) -> str | None:
     """Extracts function name from the given Call node.
 
+    The result is memoized on the node: several codegen paths ask for the
+    same call's name (dispatch, factorial detection, operand wrapping).
+
     Args:
         node (ast.Call): The function call to examine.
 
     Returns:
         str | None: The function name if it can be extracted, None otherwise.
     """
-    if isinstance(node.func, ast.Name):
-        return node.func.id
-    if isinstance(node.func, ast.Attribute):
-        return node.func.attr
-    return None
+    cached = getattr(node, "_func_name", _UNSET)
+    if cached is not _UNSET:
+        return cached
+
+    func = node.func
+    if type(func) is ast.Name:
+        name = func.id
+    elif type(func) is ast.Attribute:
+        name = func.attr
+    else:
+        name = None
+    node._func_name = name
+    return name
@@ -4,11 +4,9 @@ from __future__ import annotations
 
 import ast
 import inspect
-import sys
 import textwrap
-from typing import TYPE_CHECKING, Any
-
-import dill
+import weakref
+from typing import TYPE_CHECKING, Any, ClassVar
 
 from latexify.exceptions import LatexifySyntaxError
 
@@ -16,6 +14,79 @@ if TYPE_CHECKING:
     from collections.abc import Callable
 
 
+class CachedDispatchTransformer(ast.NodeTransformer):
+    """NodeTransformer dispatching through a per-class method table.
+
+    ast.NodeVisitor.visit concatenates "visit_" with the node type name and
+    resolves it with getattr for every node; subclasses of this transformer
+    look the handler up in a table built once per class instead.
+    """
+
+    _visit_methods: ClassVar[dict[str, Callable[..., Any]]] = {}
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._visit_methods = {
+            name[len("visit_") :]: getattr(cls, name) for name in dir(cls) if name.startswith("visit_")
+        }
+
+    def visit(self, node: ast.AST) -> Any:
+        method = self._visit_methods.get(node.__class__.__name__)
+        if method is not None:
+            return method(self, node)
+        return self.generic_visit(node)
+
+    def generic_visit(self, node: ast.AST) -> ast.AST:
+        """Recurses into child nodes, rewriting fields in place.
+
+        Semantics match ast.NodeTransformer.generic_visit, but child lists are
+        only rewritten when a visit actually changed something, instead of
+        rebuilding every list on every node.
+        """
+        visit = self.visit
+        ast_type = ast.AST
+        for field in node._fields:
+            value = getattr(node, field, None)
+            if type(value) is list:
+                new_values = []
+                changed = False
+                for item in value:
+                    if isinstance(item, ast_type):
+                        new_item = visit(item)
+                        if new_item is not item:
+                            changed = True
+                            if new_item is None:
+                                continue
+                            if not isinstance(new_item, ast_type):
+                                new_values.extend(new_item)
+                                continue
+                        new_values.append(new_item)
+                    else:
+                        new_values.append(item)
+                if changed:
+                    value[:] = new_values
+            elif isinstance(value, ast_type):
+                new_node = visit(value)
+                if new_node is not value:
+                    if new_node is None:
+                        delattr(node, field)
+                    else:
+                        setattr(node, field, new_node)
+        return node
+
+
+# Dedented sources keyed by id() of the function's code object. Entries are
+# evicted when the code object is garbage collected, so a recycled id cannot
+# alias stale source. The cache stores source rather than a tree: callers
+# mutate the tree they receive, and re-parsing the string is several times
+# cheaper than deep-copying a cached tree.
+_parse_function_cache: dict[int, str] = {}
+
+# Exact value types accepted by make_constant. All of them map to the same
+# ast.Constant construction on Python 3.8+.
+_CONSTANT_TYPES = frozenset({type(None), bool, int, float, complex, str, bytes, type(...)})
+
+
 def parse_expr(code: str) -> ast.expr:
     """Parses given Python expression.
 
@@ -37,14 +108,31 @@ def parse_function(fn: Callable[..., Any]) -> ast.Module:
     Returns:
         AST tree representing `fn`.
     """
-    try:
-        source = inspect.getsource(fn)
-    except OSError:
-        # Maybe running on console.
-        source = dill.source.getsource(fn)
-
-    # Remove extra indentation so that ast.parse runs correctly.
-    source = textwrap.dedent(source)
+    code = getattr(fn, "__code__", None)
+    key = id(code) if code is not None else None
+
+    source = _parse_function_cache.get(key) if key is not None else None
+
+    if source is None:
+        try:
+            source = inspect.getsource(fn)
+        except OSError:
+            # Maybe running on console. dill is imported lazily since this
+            # fallback is rare and the import is expensive.
+            import dill.source
+
+            source = dill.source.getsource(fn)
+
+        # Remove extra indentation so that ast.parse runs correctly. When the
+        # first line starts at column 0 (top-level functions, the common case),
+        # dedent would be a no-op, so skip its line scans entirely.
+        if source[:1] in (" ", "\t"):
+            source = textwrap.dedent(source)
+
+        if key is not None:
+            _parse_function_cache[key] = source
+            weakref.finalize(code, _parse_function_cache.pop, key, None)
+
     tree = ast.parse(source)
     if not tree.body or not isinstance(tree.body[0], ast.FunctionDef):
         raise LatexifySyntaxError("Not a function.")
@@ -86,13 +174,12 @@ def make_attribute_nested(parts: tuple[str, ...]) -> ast.Attribute | ast.Name:
     Returns:
         ast.Attribute: Generated ast.Attribute.
     """
-    if len(parts) == 1:
-        return make_name(parts[0])
+    node: ast.Attribute | ast.Name = make_name(parts[0])
+
+    for part in parts[1:]:
+        node = make_attribute(node, part)
 
-    return make_attribute(
-        make_attribute_nested(parts[:-1]),
-        parts[-1],
-    )
+    return node
 
 
 def make_constant(value: Any) -> ast.expr:
@@ -107,18 +194,7 @@ def make_constant(value: Any) -> ast.expr:
     Raises:
         ValueError: Unsupported value type.
     """
-    if sys.version_info < (3, 8):
-        if value is None or value is False or value is True:
-            return ast.NameConstant(value=value)
-        if value is ...:
-            return ast.Ellipsis()
-        if isinstance(value, (int, float, complex)):
-            return ast.Num(n=value)
-        if isinstance(value, str):
-            return ast.Str(s=value)
-        if isinstance(value, bytes):
-            return ast.Bytes(s=value)
-    elif value is None or value is ... or isinstance(value, (bool, int, float, complex, str, bytes)):
+    if type(value) in _CONSTANT_TYPES:
         return ast.Constant(value=value)
 
     raise ValueError(f"Unsupported type to generate Constant: {type(value).__name__}")
@@ -133,13 +209,9 @@ def is_constant(node: ast.AST) -> bool:
     Returns:
         True if the node is a constant, False otherwise.
     """
-    if sys.version_info < (3, 8):
-        return isinstance(
-            node,
-            (ast.Bytes, ast.Constant, ast.Ellipsis, ast.NameConstant, ast.Num, ast.Str),
-        )
-    else:
-        return isinstance(node, ast.Constant)
+    # An exact type check is cheaper than isinstance and sufficient here:
+    # the AST node classes are never subclassed in practice.
+    return type(node) is ast.Constant
 
 
 def is_str(node: ast.AST) -> bool:
@@ -151,7 +223,4 @@ def is_str(node: ast.AST) -> bool:
     Returns:
         True if the node is a str constant, False otherwise.
     """
-    if sys.version_info < (3, 8) and isinstance(node, ast.Str):
-        return True
-
-    return isinstance(node, ast.Constant) and isinstance(node.value, str)
+    return type(node) is ast.Constant and type(node.value) is str
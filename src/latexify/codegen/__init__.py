@@ -1,11 +1,28 @@
 """Package latexify.codegen."""
 
-from latexify.codegen import (
-    algorithmic_codegen,
-    expression_codegen,
-    function_codegen,
-)
-
-AlgorithmicCodegen = algorithmic_codegen.AlgorithmicCodegen
-ExpressionCodegen = expression_codegen.ExpressionVisitor
-FunctionCodegen = function_codegen.FunctionCodegen
+from typing import Any
+
+# Re-exports are resolved lazily (PEP 562) so that importing this package does
+# not eagerly load every codegen module.
+_LAZY_ATTRIBUTES = {
+    "AlgorithmicCodegen": ("latexify.codegen.algorithmic_codegen", "AlgorithmicCodegen"),
+    "ExpressionCodegen": ("latexify.codegen.expression_codegen", "ExpressionVisitor"),
+    "FunctionCodegen": ("latexify.codegen.function_codegen", "FunctionCodegen"),
+    "algorithmic_codegen": ("latexify.codegen.algorithmic_codegen", None),
+    "expression_codegen": ("latexify.codegen.expression_codegen", None),
+    "function_codegen": ("latexify.codegen.function_codegen", None),
+}
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name, attr = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    import importlib
+
+    module = importlib.import_module(module_name)
+    value = module if attr is None else getattr(module, attr)
+    globals()[name] = value
+    return value
@@ -3,15 +3,29 @@
 from __future__ import annotations
 
 import ast
-import contextlib
 from abc import ABCMeta, abstractmethod
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, ClassVar
 
 from latexify.codegen.plugin import _ArgumentsPlugin
 from latexify.exceptions import LatexifyNotSupportedError
 
 if TYPE_CHECKING:
-    from collections.abc import Generator, Iterable
+    from collections.abc import Iterable
+
+
+class _IndentLevel:
+    """Lightweight context manager incrementing the codegen's indent level."""
+
+    __slots__ = ("_codegen",)
+
+    def __init__(self, codegen: _AlgorithmCodegenBase) -> None:
+        self._codegen = codegen
+
+    def __enter__(self) -> None:
+        self._codegen._indent_level += 1
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._codegen._indent_level -= 1
 
 
 class _AlgorithmCodegenBase(_ArgumentsPlugin, metaclass=ABCMeta):
@@ -28,13 +42,20 @@ class _AlgorithmCodegenBase(_ArgumentsPlugin, metaclass=ABCMeta):
     _indent_level: int = 0
     LINE_BREAK: str  # Line break character
 
+    # Shared output buffer owned by the root IndentedBlock of a codegen pass.
+    _lines: list[str] | None = None
+
     @abstractmethod
     def _statement(self, line: str) -> str:
         """Add a statement to the algorithm."""
 
     def visit_Assign(self, node: ast.Assign) -> str:
         """Visit an Assign node."""
-        return self._statement(self.visit_and_join([*node.targets, node.value], r" \gets "))
+        targets = node.targets
+        if len(targets) == 1:
+            # Single-target assignment is the overwhelmingly common case.
+            return self._statement(rf"{self.visit(targets[0])} \gets {self.visit(node.value)}")
+        return self._statement(self.visit_and_join([*targets, node.value], r" \gets "))
 
     def visit_Expr(self, node: ast.Expr) -> str:
         """Visit an Expr node."""
@@ -45,13 +66,12 @@ class _AlgorithmCodegenBase(_ArgumentsPlugin, metaclass=ABCMeta):
         if len(node.orelse) != 0:
             raise LatexifyNotSupportedError("For statement with the else clause is not supported")
 
-        target_latex, iter_latex = self.visit(node.target), self.visit(node.iter)
-        block = IndentedBlock(self)
-        block.add(self._begin_for(target_latex, iter_latex))
-        with self._increment_level():
-            block.add(node.body)
-        block.add(self._end_for())
-        return str(block)
+        with IndentedBlock(self) as block:
+            block.add_str(self._begin_for(self.visit(node.target), self.visit(node.iter)))
+            with self._increment_level():
+                block.extend_nodes(node.body)
+            block.add_str(self._end_for())
+            return str(block)
 
     @abstractmethod
     def _begin_for(self, target_latex: str, iter_latex: str) -> str:
@@ -63,14 +83,13 @@ class _AlgorithmCodegenBase(_ArgumentsPlugin, metaclass=ABCMeta):
 
     def visit_FunctionDef(self, node: ast.FunctionDef) -> str:
         """Visit a FunctionDef node."""
-        name_latex, args_latex = node.name, self.visit(node.args)
         top = self._indent_level == 0
-        block = IndentedBlock(self)
-        block.add(self._begin_function(name_latex, args_latex, top))
-        with self._increment_level():
-            block.add(node.body)
-        block.add(self._end_function(top))
-        return str(block)
+        with IndentedBlock(self) as block:
+            block.add_str(self._begin_function(node.name, self.visit(node.args), top))
+            with self._increment_level():
+                block.extend_nodes(node.body)
+            block.add_str(self._end_function(top))
+            return str(block)
 
     @abstractmethod
     def _begin_function(self, name_latex: str, arg_latex: str, top: bool) -> str:
@@ -83,30 +102,42 @@ class _AlgorithmCodegenBase(_ArgumentsPlugin, metaclass=ABCMeta):
     def visit_If(self, node: ast.If) -> str:
         """Visit an If node."""
 
-        branches = [node]
-        while len(node.orelse) == 1 and isinstance(node.orelse[0], ast.If):
-            branches.append(node := node.orelse[0])
-
-        block = IndentedBlock(self)
-        # if and elif statements
-        for i, branch in enumerate(branches):
-            # test
-            cond_latex = self.visit(branch.test)
-            command = self._if(cond_latex) if i == 0 else self._elif(cond_latex)
-            block.add(command)
-
-            # body
-            with self._increment_level():
-                block.add(branch.body)
-
-        # else
-        if node.orelse:
-            block.add(self._else())
-            with self._increment_level():
-                block.add(node.orelse)
-
-        block.add(self._end_if())
-        return str(block)
+        # Flatten the elif chain once and cache it on the node for repeated
+        # codegen passes over the same tree.
+        branches: list[ast.If] | None = getattr(node, "_elif_chain", None)
+        if branches is None:
+            branches = [node]
+            current = node
+            while True:
+                orelse = current.orelse
+                if len(orelse) == 1 and type(orelse[0]) is ast.If:
+                    current = orelse[0]
+                    branches.append(current)
+                else:
+                    break
+            node._elif_chain = branches
+
+        with IndentedBlock(self) as block:
+            # if and elif statements
+            for i, branch in enumerate(branches):
+                # test
+                cond_latex = self.visit(branch.test)
+                command = self._if(cond_latex) if i == 0 else self._elif(cond_latex)
+                block.add_str(command)
+
+                # body
+                with self._increment_level():
+                    block.extend_nodes(branch.body)
+
+            # else
+            last_orelse = branches[-1].orelse
+            if last_orelse:
+                block.add_str(self._else())
+                with self._increment_level():
+                    block.extend_nodes(last_orelse)
+
+            block.add_str(self._end_if())
+            return str(block)
 
     @abstractmethod
     def _if(self, cond_latex: str) -> str:
@@ -141,12 +172,12 @@ class _AlgorithmCodegenBase(_ArgumentsPlugin, metaclass=ABCMeta):
         """Visit a While node."""
         if node.orelse:
             raise LatexifyNotSupportedError("While statement with the else clause is not supported")
-        block = IndentedBlock(self)
-        block.add(self._begin_while(self.visit(node.test)))
-        with self._increment_level():
-            block.add(node.body)
-        block.add(self._end_while())
-        return str(block)
+        with IndentedBlock(self) as block:
+            block.add_str(self._begin_while(self.visit(node.test)))
+            with self._increment_level():
+                block.extend_nodes(node.body)
+            block.add_str(self._end_while())
+            return str(block)
 
     @abstractmethod
     def _begin_while(self, cond_latex: str) -> str:
@@ -168,12 +199,14 @@ class _AlgorithmCodegenBase(_ArgumentsPlugin, metaclass=ABCMeta):
         """Visit a Continue node."""
         return self._statement(r"\mathbf{continue}")
 
-    @contextlib.contextmanager
-    def _increment_level(self) -> Generator[None, None, None]:
+    _level_ctx: _IndentLevel | None = None
+
+    def _increment_level(self) -> _IndentLevel:
         """Context manager controlling indent level."""
-        self._indent_level += 1
-        yield
-        self._indent_level -= 1
+        ctx = self._level_ctx
+        if ctx is None:
+            ctx = self._level_ctx = _IndentLevel(self)
+        return ctx
 
     @abstractmethod
     def add_indent(self, line: str) -> str:
@@ -188,6 +221,13 @@ class AlgorithmicCodegen(_AlgorithmCodegenBase):
     SPACES_PER_INDENT = 4
     LINE_BREAK = "\n"
 
+    # Lazily extended cache of indent prefixes, indexed by indent level.
+    _indent_prefixes: ClassVar[list[str]] = [""]
+
+    # Bounded cache of fully indented lines; hits mostly come from the fixed
+    # keyword lines (\EndFor, \EndIf, ...) emitted once per block.
+    _indented_lines: ClassVar[dict[tuple[int, str], str]] = {}
+
     def _statement(self, line):
         return self.add_indent(rf"\State ${line}$")
 
@@ -198,67 +238,88 @@ class AlgorithmicCodegen(_AlgorithmCodegenBase):
         return r"\EndFor"
 
     def _if(self, cond_latex: str):
-        return r"\If{$" + cond_latex + r"$}"
+        return rf"\If{{${cond_latex}$}}"
 
     def _elif(self, cond_latex: str):
-        return r"\ElsIf{$" + cond_latex + r"$}"
+        return rf"\ElsIf{{${cond_latex}$}}"
 
     def _else(self):
         return r"\Else"
 
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> str:
+        """Visit a FunctionDef node, wrapping the top-level one in an environment."""
+        if self._indent_level > 0:
+            return super().visit_FunctionDef(node)
+
+        begin = self.add_indent(r"\begin{algorithmic}")
+        with self._increment_level():
+            inner = super().visit_FunctionDef(node)
+        end = self.add_indent(r"\end{algorithmic}")
+        return self.LINE_BREAK.join([begin, inner, end])
+
     def _begin_function(self, name_latex: str, arg_latex: str, top: bool):
-        if top:
-            yield r"\begin{algorithmic}"
-        self._indent_level += 1
-        yield r"\Function{" + name_latex + r"}{$" + arg_latex + r"$}"
+        return rf"\Function{{{name_latex}}}{{${arg_latex}$}}"
 
     def _end_function(self, top):
-        yield r"\EndFunction"
-        self._indent_level -= 1
-        if top:
-            yield r"\end{algorithmic}"
+        return r"\EndFunction"
 
     def _end_if(self):
         return r"\EndIf"
 
     def _begin_while(self, cond_latex: str):
-        return r"\While{$" + cond_latex + r"$}"
+        return rf"\While{{${cond_latex}$}}"
 
     def _end_while(self):
         return r"\EndWhile"
 
     def _return(self, value_latex):
-        return r"\State \Return " + f"${value_latex}$" if value_latex is not None else r"\State \Return"
+        return rf"\State \Return ${value_latex}$" if value_latex is not None else r"\State \Return"
 
     def add_indent(self, line):
-        return self._indent_level * self.SPACES_PER_INDENT * " " + line
+        key = (self._indent_level, line)
+        cached = self._indented_lines.get(key)
+        if cached is not None:
+            return cached
+        prefixes = self._indent_prefixes
+        while len(prefixes) <= self._indent_level:
+            prefixes.append(len(prefixes) * self.SPACES_PER_INDENT * " ")
+        out = prefixes[self._indent_level] + line
+        if len(self._indented_lines) < 256:
+            self._indented_lines[key] = out
+        return out
 
 
 class IPythonLatexifier(_AlgorithmCodegenBase):
     EM_PER_INDENT = 1
     LINE_BREAK = r" \\ "
 
+    # Lazily extended cache of \hspace prefixes, indexed by indent level.
+    _indent_prefixes: ClassVar[list[str]] = [""]
+
+    # Bounded cache of fully indented lines, mirroring AlgorithmicCodegen.
+    _indented_lines: ClassVar[dict[tuple[int, str], str]] = {}
+
     def _statement(self, line):
         return self.add_indent(line)
 
     def _begin_for(self, target_latex: str, iter_latex: str):
-        return r"\mathbf{for} \ " + target_latex + r" \in " + iter_latex + r" \ \mathbf{do}"
+        return rf"\mathbf{{for}} \ {target_latex} \in {iter_latex} \ \mathbf{{do}}"
 
     def _end_for(self):
         return r"\mathbf{end \ for}"
 
     def _if(self, cond_latex: str):
-        return r"\mathbf{if} \ " + cond_latex
+        return rf"\mathbf{{if}} \ {cond_latex}"
 
     def _elif(self, cond_latex: str):
-        return r"\mathbf{else if} \ " + cond_latex
+        return rf"\mathbf{{else if}} \ {cond_latex}"
 
     def _else(self):
         return r"\mathbf{else}"
 
     def _begin_function(self, name_latex: str, arg_latex: str, top: bool):
         s = r"\begin{array}{l} " if top else ""
-        return s + r"\mathbf{function} \ " + f"{self.visit(name_latex)}({arg_latex})"
+        return rf"{s}\mathbf{{function}} \ {self.visit(name_latex)}({arg_latex})"
 
     def _end_function(self, top):
         s = r"\mathbf{end \ function}"
@@ -268,33 +329,82 @@ class IPythonLatexifier(_AlgorithmCodegenBase):
         return r"\mathbf{end \ if}"
 
     def _begin_while(self, cond_latex):
-        return r"\mathbf{while} \ " + cond_latex
+        return rf"\mathbf{{while}} \ {cond_latex}"
 
     def _end_while(self):
         return r"\mathbf{end \ while}"
 
     def _return(self, value_latex: str | None):
-        return r"\mathbf{return} \ " + value_latex if value_latex is not None else r"\mathbf{return}"
+        return rf"\mathbf{{return}} \ {value_latex}" if value_latex is not None else r"\mathbf{return}"
 
     def add_indent(self, line):
-        return rf"\hspace{{{self._indent_level * self.EM_PER_INDENT}em}} {line}" if self._indent_level > 0 else line
+        if self._indent_level == 0:
+            return line
+        key = (self._indent_level, line)
+        cached = self._indented_lines.get(key)
+        if cached is not None:
+            return cached
+        prefixes = self._indent_prefixes
+        while len(prefixes) <= self._indent_level:
+            prefixes.append(rf"\hspace{{{len(prefixes) * self.EM_PER_INDENT}em}} ")
+        out = prefixes[self._indent_level] + line
+        if len(self._indented_lines) < 256:
+            self._indented_lines[key] = out
+        return out
+
+
+# Sentinel returned by nested blocks whose lines were already appended to the
+# shared buffer; the enclosing block skips appending it.
+_IN_BUFFER = "\x00in-buffer"
 
 
 class IndentedBlock:
-    _items: list[str]
-    _visitor: AlgorithmicCodegen
+    """Accumulates output lines into the visitor's shared flat buffer.
+
+    The first block created for a codegen pass owns the buffer; nested blocks
+    append to the same list, so the final string is built with exactly one
+    join at the root instead of one join per nesting level.
+
+    Used as a context manager: the root block releases the buffer if any
+    visit inside the block raises, leaving the visitor reusable after a
+    failed codegen pass.
+    """
+
+    _visitor: _AlgorithmCodegenBase
+    _root: bool
 
     def __init__(self, visitor) -> None:
-        self._items = []
         self._visitor = visitor
-
-    def add(self, item: str | ast.AST | Iterable[str | ast.AST]) -> None:
-        if isinstance(item, (ast.AST, str)):
-            latex = self._visitor.add_indent(item) if isinstance(item, str) else self._visitor.visit(item)
-            self._items.append(latex)
-        else:
-            for sub_item in item:
-                self.add(sub_item)
+        self._root = visitor._lines is None
+        if self._root:
+            visitor._lines = []
+
+    def __enter__(self) -> IndentedBlock:
+        return self
+
+    def __exit__(self, exc_type: object, *exc_info: object) -> None:
+        if exc_type is not None and self._root:
+            self._visitor._lines = None
+
+    def add_str(self, line: str) -> None:
+        """Append one already-rendered line at the current indent level."""
+        visitor = self._visitor
+        visitor._lines.append(visitor.add_indent(line))
+
+    def extend_nodes(self, nodes: Iterable[ast.AST]) -> None:
+        """Visit a sequence of statements and append their output lines."""
+        visitor = self._visitor
+        lines = visitor._lines
+        visit = visitor.visit
+        for node in nodes:
+            latex = visit(node)
+            if latex is not _IN_BUFFER:
+                lines.append(latex)
 
     def __str__(self) -> str:
-        return self._visitor.LINE_BREAK.join(self._items)
+        if not self._root:
+            return _IN_BUFFER
+        visitor = self._visitor
+        lines = visitor._lines
+        visitor._lines = None
+        return visitor.LINE_BREAK.join(lines)
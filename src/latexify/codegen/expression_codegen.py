@@ -3,14 +3,22 @@
 from __future__ import annotations
 
 import ast
-import re
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from latexify.analyzers import extract_function_name_or_none
 from latexify.codegen import expression_rules
 from latexify.codegen.plugin import Plugin
 from latexify.exceptions import LatexifyNotSupportedError
 
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+# Bracket fragments shared across the sequence and wrapping visitors.
+_PAREN_L, _PAREN_R = r"\mathopen{}\left( ", r" \mathclose{}\right)"
+_BRACKET_L, _BRACKET_R = r"\mathopen{}\left[ ", r" \mathclose{}\right]"
+_BRACE_L, _BRACE_R = r"\mathopen{}\left\{ ", r" \mathclose{}\right\}"
+
 
 class ExpressionVisitor(Plugin):
     """Translates mathematical expressions to LaTeX.
@@ -30,32 +38,36 @@ class ExpressionVisitor(Plugin):
         self._compare_ops = expression_rules.SET_COMPARE_OPS if use_set_symbols else expression_rules.COMPARE_OPS
 
     def visit_Tuple(self, node: ast.Tuple) -> str:
-        return r"\mathopen{}\left( " + self.visit_and_join(node.elts) + r" \mathclose{}\right)"
+        return _PAREN_L + self.visit_and_join(node.elts) + _PAREN_R
 
     def visit_List(self, node: ast.List) -> str:
-        return r"\mathopen{}\left[ " + self.visit_and_join(node.elts) + r" \mathclose{}\right]"
+        return _BRACKET_L + self.visit_and_join(node.elts) + _BRACKET_R
 
     def visit_Set(self, node: ast.Set) -> str:
-        return r"\mathopen{}\left\{ " + self.visit_and_join(node.elts) + r" \mathclose{}\right\}"
+        return _BRACE_L + self.visit_and_join(node.elts) + _BRACE_R
 
     def visit_ListComp(self, node: ast.ListComp) -> str:
         """Visit a ListComp node."""
-        return (
-            r"\mathopen{}\left[ "
-            + self.visit(node.elt)
-            + r" \mid "
-            + self.visit_and_join(node.generators)
-            + r" \mathclose{}\right]"
+        return "".join(
+            [
+                _BRACKET_L,
+                self.visit(node.elt),
+                r" \mid ",
+                self.visit_and_join(node.generators),
+                _BRACKET_R,
+            ]
         )
 
     def visit_SetComp(self, node: ast.SetComp) -> str:
         """Visit a SetComp node."""
-        return (
-            r"\mathopen{}\left\{ "
-            + self.visit(node.elt)
-            + r" \mid "
-            + self.visit_and_join(node.generators)
-            + r" \mathclose{}\right\}"
+        return "".join(
+            [
+                _BRACE_L,
+                self.visit(node.elt),
+                r" \mid ",
+                self.visit_and_join(node.generators),
+                _BRACE_R,
+            ]
         )
 
     def visit_comprehension(self, node: ast.comprehension) -> str:
@@ -67,7 +79,7 @@ class ExpressionVisitor(Plugin):
             return target
 
         conds = [target] + [self.visit(cond) for cond in node.ifs]
-        wrapped = [r"\mathopen{}\left( " + s + r" \mathclose{}\right)" for s in conds]
+        wrapped = [_PAREN_L + s + _PAREN_R for s in conds]
         return r" \land ".join(wrapped)
 
     def visit_Call(self, node: ast.Call) -> str:
@@ -110,7 +122,7 @@ class ExpressionVisitor(Plugin):
                     rule.right,
                 ]
 
-        return " ".join(x for x in elements if x)
+        return " ".join([x for x in elements if x])
 
     # From Python 3.8
     def visit_Constant(self, node: ast.Constant) -> str:
@@ -157,7 +169,7 @@ class ExpressionVisitor(Plugin):
         child_prec = expression_rules.get_precedence(child)
 
         if force_wrap or child_prec < parent_prec:
-            return rf"\mathopen{{}}\left( {latex} \mathclose{{}}\right)"
+            return f"{_PAREN_L}{latex}{_PAREN_R}"
 
         return latex
 
@@ -182,8 +194,7 @@ class ExpressionVisitor(Plugin):
 
         if isinstance(child, ast.Call):
             child_fn_name = extract_function_name_or_none(child)
-            rule = expression_rules.BUILTIN_FUNCS.get(child_fn_name) if child_fn_name is not None else None
-            if rule is not None and rule.is_wrapped:
+            if child_fn_name is not None and child_fn_name in expression_rules.WRAPPED_BUILTIN_FUNCS:
                 return self.visit(child)
 
         if not isinstance(child, ast.BinOp):
@@ -191,7 +202,7 @@ class ExpressionVisitor(Plugin):
 
         latex = self.visit(child)
 
-        if expression_rules.BIN_OP_RULES[type(child.op)].is_wrapped:
+        if type(child.op) in expression_rules.WRAPPED_BIN_OPS:
             return latex
 
         child_prec = expression_rules.get_precedence(child)
@@ -199,11 +210,71 @@ class ExpressionVisitor(Plugin):
         if child_prec > parent_prec or (child_prec == parent_prec and not operand_rule.force):
             return latex
 
-        return rf"\mathopen{{}}\left( {latex} \mathclose{{}}\right)"
+        return f"{_PAREN_L}{latex}{_PAREN_R}"
 
-    _l_bracket_pattern = re.compile(r"^\\mathopen.*")
-    _r_bracket_pattern = re.compile(r".*\\mathclose[^ ]+$")
-    _r_word_pattern = re.compile(r"\\mathrm\{[^ ]+\}$")
+    def _classify_left_operand(self, l_latex: str, l_expr: ast.expr) -> str:
+        """Classifies the left operand of a multiplication as a type tag.
+
+        Tags: "f" function call, "b" bracketed, "w" mathrm word, "n" numeric,
+        "a" single-letter atom, "m" multi-letter expression.
+        """
+        # NOTE(odashi): For compatibility with Python 3.7, we compare the generated
+        # caracter type directly to determine the "numeric" type.
+
+        if type(l_expr) is ast.Call:
+            return "f"
+        if _ends_with_r_bracket(l_latex):
+            return "b"
+        if _is_mathrm_word(l_latex):
+            return "w"
+        if l_latex[-1].isnumeric():
+            return "n"
+        # Bind the node types once; the walk below touches them per level.
+        unary_op, bin_op, compare, bool_op = ast.UnaryOp, ast.BinOp, ast.Compare, ast.BoolOp
+        le = l_expr
+        while True:
+            le_type = type(le)
+            if le_type is unary_op:
+                le = le.operand
+            elif le_type is bin_op:
+                le = le.right
+            elif le_type is compare:
+                le = le.comparators[-1]
+            elif le_type is bool_op:
+                le = le.values[-1]
+            else:
+                break
+        return "a" if type(le) is ast.Name and len(le.id) == 1 else "m"
+
+    def _classify_right_operand(self, r_latex: str, r_expr: ast.expr) -> str | None:
+        """Classifies the right operand of a multiplication as a type tag.
+
+        Returns None for a leading unary minus, which always needs \\cdot.
+        """
+        if type(r_expr) is ast.Call:
+            return "f"
+        if r_latex.startswith("\\mathopen"):
+            return "b"
+        if r_latex.startswith("\\mathrm"):
+            return "w"
+        if r_latex[0].isnumeric():
+            return "n"
+        unary_op, bin_op, compare, bool_op = ast.UnaryOp, ast.BinOp, ast.Compare, ast.BoolOp
+        re = r_expr
+        while True:
+            re_type = type(re)
+            if re_type is unary_op:
+                if type(re.op) is ast.USub:
+                    # NOTE(odashi): Unary "-" always require \cdot.
+                    return None
+                re = re.operand
+            elif re_type is bin_op or re_type is compare:
+                re = re.left
+            elif re_type is bool_op:
+                re = re.values[0]
+            else:
+                break
+        return "a" if type(re) is ast.Name and len(re.id) == 1 else "m"
 
     def _should_remove_multiply_op(self, l_latex: str, r_latex: str, l_expr: ast.expr, r_expr: ast.expr):
         """Determine whether the multiply operator should be removed or not.
@@ -215,76 +286,25 @@ class ExpressionVisitor(Plugin):
         This function doesn't fully implements the above requirements, but only
         essential ones necessary to release v0.3.
         """
-
-        # NOTE(odashi): For compatibility with Python 3.7, we compare the generated
-        # caracter type directly to determine the "numeric" type.
-
-        if isinstance(l_expr, ast.Call):
-            l_type = "f"
-        elif self._r_bracket_pattern.match(l_latex):
-            l_type = "b"
-        elif self._r_word_pattern.match(l_latex):
-            l_type = "w"
-        elif l_latex[-1].isnumeric():
-            l_type = "n"
-        else:
-            le = l_expr
-            while True:
-                if isinstance(le, ast.UnaryOp):
-                    le = le.operand
-                elif isinstance(le, ast.BinOp):
-                    le = le.right
-                elif isinstance(le, ast.Compare):
-                    le = le.comparators[-1]
-                elif isinstance(le, ast.BoolOp):
-                    le = le.values[-1]
-                else:
-                    break
-            l_type = "a" if isinstance(le, ast.Name) and len(le.id) == 1 else "m"
-
-        if isinstance(r_expr, ast.Call):
-            r_type = "f"
-        elif self._l_bracket_pattern.match(r_latex):
-            r_type = "b"
-        elif r_latex.startswith("\\mathrm"):
-            r_type = "w"
-        elif r_latex[0].isnumeric():
-            r_type = "n"
-        else:
-            re = r_expr
-            while True:
-                if isinstance(re, ast.UnaryOp):
-                    if isinstance(re.op, ast.USub):
-                        # NOTE(odashi): Unary "-" always require \cdot.
-                        return False
-                    re = re.operand
-                elif isinstance(re, (ast.BinOp, ast.Compare)):
-                    re = re.left
-                elif isinstance(re, ast.BoolOp):
-                    re = re.values[0]
-                else:
-                    break
-            r_type = "a" if isinstance(re, ast.Name) and len(re.id) == 1 else "m"
-
-        if r_type == "n":
+        r_type = self._classify_right_operand(r_latex, r_expr)
+        if r_type is None or r_type == "n":
             return False
-        if l_type in "bn":
-            return True
-        if l_type in "am" and r_type in "am":
-            return True
-        return False
+        l_type = self._classify_left_operand(l_latex, l_expr)
+        return (l_type, r_type) in _REMOVE_MULT_PAIRS
 
     def visit_BinOp(self, node: ast.BinOp) -> str:
         """Visit a BinOp node."""
         prec = expression_rules.get_precedence(node)
-        rule = self._bin_op_rules[type(node.op)]
+        op_type = type(node.op)
+        rule = self._bin_op_rules[op_type]
         lhs = self._wrap_binop_operand(node.left, prec, rule.operand_left)
         rhs = self._wrap_binop_operand(node.right, prec, rule.operand_right)
 
-        if type(node.op) in [ast.Mult, ast.MatMult] and self._should_remove_multiply_op(
-            lhs, rhs, node.left, node.right
-        ):
-            return f"{rule.latex_left}{lhs} {rhs}{rule.latex_right}"
+        if op_type is ast.Mult or op_type is ast.MatMult:
+            # A numeric right operand always keeps \cdot; skip the classifier.
+            keep_op = type(node.right) is ast.Constant and rhs[:1].isnumeric()
+            if not keep_op and self._should_remove_multiply_op(lhs, rhs, node.left, node.right):
+                return f"{rule.latex_left}{lhs} {rhs}{rule.latex_right}"
 
         return f"{rule.latex_left}{lhs}{rule.latex_middle}{rhs}{rule.latex_right}"
 
@@ -296,11 +316,14 @@ class ExpressionVisitor(Plugin):
     def visit_Compare(self, node: ast.Compare) -> str:
         """Visit a Compare node."""
         parent_prec = expression_rules.get_precedence(node)
-        lhs = self._wrap_operand(node.left, parent_prec)
-        ops = [self._compare_ops[type(x)] for x in node.ops]
-        rhs = [self._wrap_operand(x, parent_prec) for x in node.comparators]
-        ops_rhs = [f" {o} {r}" for o, r in zip(ops, rhs)]
-        return lhs + "".join(ops_rhs)
+        compare_ops = self._compare_ops
+        parts = [self._wrap_operand(node.left, parent_prec)]
+        for op, comparator in zip(node.ops, node.comparators):
+            parts.append(" ")
+            parts.append(compare_ops[type(op)])
+            parts.append(" ")
+            parts.append(self._wrap_operand(comparator, parent_prec))
+        return "".join(parts)
 
     def visit_BoolOp(self, node: ast.BoolOp) -> str:
         """Visit a BoolOp node."""
@@ -311,18 +334,22 @@ class ExpressionVisitor(Plugin):
 
     def visit_IfExp(self, node: ast.IfExp) -> str:
         """Visit an IfExp node"""
-        latex = r"\left\{ \begin{array}{ll} "
+        # Collect fragments and join once to keep allocation linear in the
+        # number of branches.
+        parts = [r"\left\{ \begin{array}{ll} "]
 
         current_expr: ast.expr = node
 
         while isinstance(current_expr, ast.IfExp):
-            cond_latex = self.visit(current_expr.test)
-            true_latex = self.visit(current_expr.body)
-            latex += true_latex + r", & \mathrm{if} \ " + cond_latex + r" \\ "
+            parts.append(self.visit(current_expr.body))
+            parts.append(r", & \mathrm{if} \ ")
+            parts.append(self.visit(current_expr.test))
+            parts.append(r" \\ ")
             current_expr = current_expr.orelse
 
-        latex += self.visit(current_expr)
-        return latex + r", & \mathrm{otherwise} \end{array} \right."
+        parts.append(self.visit(current_expr))
+        parts.append(r", & \mathrm{otherwise} \end{array} \right.")
+        return "".join(parts)
 
     # Until 3.8
     def visit_Index(self, node: ast.Index) -> str:
@@ -342,14 +369,15 @@ class ExpressionVisitor(Plugin):
                 - The root value of the subscription.
                 - Sequence of incices.
         """
-        if isinstance(node.value, ast.Subscript):
-            value, indices = self._convert_nested_subscripts(node.value)
-        else:
-            value = self.visit(node.value)
-            indices = []
-
-        indices.append(self.visit(node.slice))
-        return value, indices
+        # Walk down the chain iteratively; the recursion this replaces paid a
+        # Python frame per subscript level.
+        indices: list[str] = []
+        current: ast.expr = node
+        while type(current) is ast.Subscript:
+            indices.append(self.visit(current.slice))
+            current = current.value
+        indices.reverse()
+        return self.visit(current), indices
 
     def visit_Subscript(self, node: ast.Subscript) -> str:
         """Visit a Subscript node (e.g. x[i][j])."""
@@ -361,6 +389,66 @@ class ExpressionVisitor(Plugin):
         return f"{value}_{{{indices_str}}}"
 
 
+# Tag pairs for which the multiply operator between the operands is dropped.
+# Numeric right operands never reach this table; they are rejected upfront.
+_REMOVE_MULT_PAIRS: frozenset[tuple[str, str]] = frozenset(
+    (l_type, r_type)
+    for l_type in "fbwnam"
+    for r_type in "fbwam"
+    if l_type in "bn" or (l_type in "am" and r_type in "am")
+)
+
+
+def _ends_with_r_bracket(latex: str) -> bool:
+    """Whether the latex ends with a closing bracket command plus a delimiter.
+
+    Plain-string equivalent of the former regex ``.*\\mathclose[^ ]+$``.
+    """
+    token = latex[latex.rfind(" ") + 1 :]
+    idx = token.find("\\mathclose")
+    return idx != -1 and idx + len("\\mathclose") < len(token)
+
+
+def _is_mathrm_word(latex: str) -> bool:
+    """Whether the latex is a single ``\\mathrm{...}`` word.
+
+    Plain-string equivalent of the former regex ``\\mathrm\\{[^ ]+\\}$``
+    anchored at the start of the string.
+    """
+    return latex.startswith("\\mathrm{") and latex.endswith("}") and len(latex) > 9 and " " not in latex
+
+
+def _convert_mathrm_constant(value: Any) -> str:
+    return r"\mathrm{" + str(value) + "}"
+
+
+def _convert_str_constant(value: str) -> str:
+    return r'\textrm{"' + _escape(value) + '"}'
+
+
+def _convert_bytes_constant(value: bytes) -> str:
+    return r"\textrm{" + str(value) + "}"
+
+
+def _convert_ellipsis_constant(_value: Any) -> str:
+    return r"\cdots"
+
+
+# Converters by the exact constant type. bool must not fall through to the
+# numeric formatting, hence dispatching on type(value) rather than isinstance.
+# TODO(odashi): Support other symbols for the imaginary unit than j.
+_CONST_CONVERTERS: dict[type, Callable[[Any], str]] = {
+    type(None): _convert_mathrm_constant,
+    bool: _convert_mathrm_constant,
+    int: str,
+    float: str,
+    complex: str,
+    str: _convert_str_constant,
+    bytes: _convert_bytes_constant,
+    type(...): _convert_ellipsis_constant,
+}
+
+
 def convert_constant(value: Any) -> str:
     """Helper to convert constant values to LaTeX.
 
@@ -370,35 +458,29 @@ def convert_constant(value: Any) -> str:
     Returns:
         The LaTeX representation of `value`.
     """
-    if value is None or isinstance(value, bool):
-        return r"\mathrm{" + str(value) + "}"
-    if isinstance(value, (int, float, complex)):
-        # TODO(odashi): Support other symbols for the imaginary unit than j.
-        return str(value)
-    if isinstance(value, str):
-        return r'\textrm{"' + _escape(value) + '"}'
-    if isinstance(value, bytes):
-        return r"\textrm{" + str(value) + "}"
-    if value is ...:
-        return r"\cdots"
-    raise LatexifyNotSupportedError(f"Unrecognized constant: {type(value).__name__}")
+    converter = _CONST_CONVERTERS.get(type(value))
+    if converter is None:
+        raise LatexifyNotSupportedError(f"Unrecognized constant: {type(value).__name__}")
+    return converter(value)
+
+
+# See https://tex.stackexchange.com/a/34586
+_ESCAPE_TRANS = str.maketrans(
+    {
+        "\\": r"\textbackslash{}",
+        "~": r"\textasciitilde{}",
+        "^": r"\textasciicircum{}",
+        "&": r"\&",
+        "%": r"\%",
+        "$": r"\$",
+        "#": r"\#",
+        "_": r"\_",
+        "{": r"\{",
+        "}": r"\}",
+    }
+)
 
 
 def _escape(latex: str):
     """Escape special characters in the latex string."""
-    # See https://tex.stackexchange.com/a/34586
-    trans = str.maketrans(
-        {
-            "\\": r"\textbackslash{}",
-            "~": r"\textasciitilde{}",
-            "^": r"\textasciicircum{}",
-            "&": r"\&",
-            "%": r"\%",
-            "$": r"\$",
-            "#": r"\#",
-            "_": r"\_",
-            "{": r"\{",
-            "}": r"\}",
-        }
-    )
-    return latex.translate(trans)
+    return latex.translate(_ESCAPE_TRANS)
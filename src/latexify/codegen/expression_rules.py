@@ -5,6 +5,10 @@ from __future__ import annotations
 import ast
 import functools
 from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
 
 # Precedences of operators for BoolOp, BinOp, UnaryOp, and Compare nodes.
 # Note that this value affects only the appearance of surrounding parentheses for each
@@ -62,6 +66,9 @@ _INF_PRECEDENCE = 1_000_000
 def get_precedence(node: ast.AST) -> int:
     """Obtains the precedence of the subtree.
 
+    The result is memoized on the node itself: codegen asks for the same
+    node's precedence once as a parent and again as a child operand.
+
     Args:
         node: Subtree to investigate.
 
@@ -69,18 +76,41 @@ def get_precedence(node: ast.AST) -> int:
         If `node` is a subtree with some operator, returns the precedence of the
         operator. Otherwise, returns a number larger enough from other precedences.
     """
-    if isinstance(node, ast.Call):
-        return _CALL_PRECEDENCE
+    cached = getattr(node, "_precedence", None)
+    if cached is not None:
+        return cached
+    prec = _get_precedence(node)
+    node._precedence = prec
+    return prec
+
+
+def _prec_call(_node: ast.Call) -> int:
+    return _CALL_PRECEDENCE
+
+
+def _prec_op(node: ast.BinOp | ast.UnaryOp | ast.BoolOp) -> int:
+    return _PRECEDENCES[type(node.op)]
 
-    if isinstance(node, (ast.BinOp, ast.UnaryOp, ast.BoolOp)):
-        return _PRECEDENCES[type(node.op)]
 
-    if isinstance(node, ast.Compare):
-        # Compare operators have the same precedence. It is enough to check only the
-        # first operator.
-        return _PRECEDENCES[type(node.ops[0])]
+def _prec_compare(node: ast.Compare) -> int:
+    # Compare operators have the same precedence. It is enough to check only the
+    # first operator.
+    return _PRECEDENCES[type(node.ops[0])]
 
-    return _INF_PRECEDENCE
+
+_NODE_PREC_FNS: dict[type[ast.AST], Callable[[ast.AST], int]] = {
+    ast.Call: _prec_call,
+    ast.BinOp: _prec_op,
+    ast.UnaryOp: _prec_op,
+    ast.BoolOp: _prec_op,
+    ast.Compare: _prec_compare,
+}
+
+
+def _get_precedence(node: ast.AST) -> int:
+    """Uncached implementation of get_precedence."""
+    fn = _NODE_PREC_FNS.get(type(node))
+    return fn(node) if fn is not None else _INF_PRECEDENCE
 
 
 @dataclass(frozen=True)
@@ -160,6 +190,10 @@ SET_BIN_OP_RULES: dict[type[ast.operator], BinOpRule] = {
     ast.BitOr: BinOpRule("", r" \cup ", ""),
 }
 
+# Binary operator types whose rendered form is already bracketed. The plain
+# and set rule tables agree on this flag.
+WRAPPED_BIN_OPS: frozenset[type[ast.operator]] = frozenset(op for op, rule in BIN_OP_RULES.items() if rule.is_wrapped)
+
 UNARY_OPS: dict[type[ast.unaryop], str] = {
     ast.Invert: r"\mathord{\sim} ",
     ast.UAdd: "+",  # Explicitly adds the $+$ operator.
@@ -265,3 +299,7 @@ BUILTIN_FUNCS: dict[str, FunctionRule] = {
     "tan": _UnaryRule(r"\tan"),
     "tanh": _UnaryRule(r"\tanh"),
 }
+
+# Names of builtin functions whose output is already wrapped by brackets.
+# Precomputed so operand wrapping can use one set membership test.
+WRAPPED_BUILTIN_FUNCS: frozenset[str] = frozenset(name for name, rule in BUILTIN_FUNCS.items() if rule.is_wrapped)
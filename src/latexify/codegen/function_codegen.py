@@ -89,7 +89,9 @@ class FunctionCodegen(_ArgumentsPlugin):
 
     def visit_If(self, node: ast.If) -> str:
         """Visit an If node."""
-        latex = r"\left\{ \begin{array}{ll} "
+        # Collect fragments and join once to keep allocation linear in the
+        # number of branches.
+        parts = [r"\left\{ \begin{array}{ll} "]
 
         current_stmt: ast.stmt = node
 
@@ -97,13 +99,15 @@ class FunctionCodegen(_ArgumentsPlugin):
             if len(current_stmt.body) != 1 or len(current_stmt.orelse) != 1:
                 raise exceptions.LatexifySyntaxError("Multiple statements are not supported in If nodes.")
 
-            cond_latex = self.visit(current_stmt.test)
-            true_latex = self.visit(current_stmt.body[0])
-            latex += true_latex + r", & \mathrm{if} \ " + cond_latex + r" \\ "
+            parts.append(self.visit(current_stmt.body[0]))
+            parts.append(r", & \mathrm{if} \ ")
+            parts.append(self.visit(current_stmt.test))
+            parts.append(r" \\ ")
             current_stmt = current_stmt.orelse[0]
 
-        latex += self.visit(current_stmt)
-        return latex + r", & \mathrm{otherwise} \end{array} \right."
+        parts.append(self.visit(current_stmt))
+        parts.append(r", & \mathrm{otherwise} \end{array} \right.")
+        return "".join(parts)
 
     def visit_Match(self, node: ast.Match) -> str:
         """Visit a Match node"""
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, ClassVar
 
 from latexify.analyzers import analyze_attribute
 from latexify.codegen.plugin import Plugin
@@ -20,6 +20,10 @@ class IdentifierConverter(Plugin):
             These custom mappings take precedence over the other options. Defaults to None.
     """
 
+    # Conversion caches shared by converters without custom mappings,
+    # keyed by (use_math_symbols, use_mathrm).
+    _shared_caches: ClassVar[dict[tuple[bool, bool], dict[str, tuple[str, bool]]]] = {}
+
     def __init__(
         self,
         use_math_symbols: bool = False,
@@ -29,6 +33,14 @@ class IdentifierConverter(Plugin):
         self._use_math_symbols = use_math_symbols
         self._use_mathrm = use_mathrm
         self._id_to_latex = id_to_latex or {}
+        # The flags are fixed per instance, so the name alone is a sufficient
+        # cache key for converted identifiers. Converters without custom
+        # mappings share one cache per flag combination, so repeated
+        # latexification keeps its warm cache across instances.
+        if id_to_latex:
+            self._cache: dict[str, tuple[str, bool]] = {}
+        else:
+            self._cache = self._shared_caches.setdefault((use_math_symbols, use_mathrm), {})
 
     def visit_str(self, name: str) -> str:
         """Treat raw strings passed to `visit` as identifiers.
@@ -43,13 +55,26 @@ class IdentifierConverter(Plugin):
 
     def visit_Attribute(self, node: ast.Attribute):
         parts = analyze_attribute(node)
-        name = ".".join(parts)
+        name = getattr(node, "_dotted_name", None)
+        if name is None:
+            name = ".".join(parts)
+            node._dotted_name = name
         if name in self._id_to_latex:
             return self._id_to_latex[name]
         return self.visit_and_join(parts, ".")
 
     def convert_identifier(self, name: str) -> str:
         """Converts Python identifiers (e.g. variable names) to appropriate LaTeX expression."""
+        cached = self._cache.get(name)
+        if cached is not None:
+            return cached
+
+        result = self._convert_identifier(name)
+        self._cache[name] = result
+        return result
+
+    def _convert_identifier(self, name: str) -> tuple[str, bool]:
+        """Uncached implementation of convert_identifier."""
         if name in self._id_to_latex:
             return self._id_to_latex[name], False
 
@@ -71,59 +96,62 @@ class IdentifierConverter(Plugin):
                 return r"\widehat{" + first + r"}", False
             return first + r"_{\mathrm{" + parts[1] + r"}}", False
 
-        escaped = name.replace("_", r"\_")
+        # Only pay for the escape copy when there is an underscore to escape.
+        escaped = name.replace("_", r"\_") if "_" in name else name
 
         return r"\mathrm{" + escaped + r"}" if self._use_mathrm else escaped, False
 
 
-MATH_SYMBOLS = {
-    "aleph",
-    "alpha",
-    "beta",
-    "beth",
-    "chi",
-    "daleth",
-    "delta",
-    "digamma",
-    "epsilon",
-    "eta",
-    "gamma",
-    "gimel",
-    "hbar",
-    "infty",
-    "iota",
-    "kappa",
-    "lambda",
-    "mu",
-    "nabla",
-    "nu",
-    "omega",
-    "phi",
-    "pi",
-    "psi",
-    "rho",
-    "sigma",
-    "tau",
-    "theta",
-    "upsilon",
-    "varepsilon",
-    "varkappa",
-    "varphi",
-    "varpi",
-    "varrho",
-    "varsigma",
-    "vartheta",
-    "xi",
-    "zeta",
-    "Delta",
-    "Gamma",
-    "Lambda",
-    "Omega",
-    "Phi",
-    "Pi",
-    "Psi",
-    "Sigma",
-    "Theta",
-    "Upsilon",
-    "Xi",
-}
+MATH_SYMBOLS = frozenset(
+    {
+        "aleph",
+        "alpha",
+        "beta",
+        "beth",
+        "chi",
+        "daleth",
+        "delta",
+        "digamma",
+        "epsilon",
+        "eta",
+        "gamma",
+        "gimel",
+        "hbar",
+        "infty",
+        "iota",
+        "kappa",
+        "lambda",
+        "mu",
+        "nabla",
+        "nu",
+        "omega",
+        "phi",
+        "pi",
+        "psi",
+        "rho",
+        "sigma",
+        "tau",
+        "theta",
+        "upsilon",
+        "varepsilon",
+        "varkappa",
+        "varphi",
+        "varpi",
+        "varrho",
+        "varsigma",
+        "vartheta",
+        "xi",
+        "zeta",
+        "Delta",
+        "Gamma",
+        "Lambda",
+        "Omega",
+        "Phi",
+        "Pi",
+        "Psi",
+        "Sigma",
+        "Theta",
+        "Upsilon",
+        "Xi",
+    }
+)
@@ -2,10 +2,10 @@ from __future__ import annotations
 
 import ast
 from abc import ABCMeta
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, ClassVar
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Callable, Iterable
 
     from latexify.codegen.plugin_stack import Stack
 
@@ -15,8 +15,21 @@ class Plugin(ast.NodeVisitor, metaclass=ABCMeta):
 
     _base: Stack | None = None
 
+    # Maps AST node type names to the implementing methods. Built once per
+    # subclass so that dispatch avoids a getattr per visited node.
+    _visit_methods: ClassVar[dict[str, Callable[..., str]]] = {}
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._visit_methods = {
+            name[len("visit_") :]: getattr(cls, name) for name in dir(cls) if name.startswith("visit_")
+        }
+
     def _setup(self, stack: Stack) -> None:
         self._base = stack
+        # Shadow the class-level visit with the stack's bound method so the
+        # delegation costs one call instead of two.
+        self.visit = stack.visit
 
     def visit(self, node: ast.AST) -> str:
         """Redirects the visit call to the base plugin."""
@@ -25,11 +38,14 @@ class Plugin(ast.NodeVisitor, metaclass=ABCMeta):
     def generic_visit(self, _node: ast.AST):
         # differentiate from actual LatexifyNotSupportedError
         # that gets thrown by the PluginStack
+        # A fresh instance each time: re-raising a shared one would keep
+        # appending to its __traceback__, pinning one frame chain per decline.
         raise NotImplementedError
 
     def visit_and_join(self, items: Iterable[ast.AST], sep: str = ", ") -> str:
         """Visit a list of AST nodes and join the results."""
-        return sep.join(map(self.visit, items))
+        visit = self._base.visit
+        return sep.join([visit(item) for item in items])
 
 
 class _ArgumentsPlugin(Plugin):
@@ -45,4 +61,7 @@ class _ArgumentsPlugin(Plugin):
 
     def visit_arguments(self, node: ast.arguments) -> str:
         """Translate a list of arguments."""
-        return self.visit_and_join(node.args)
+        # Bind the stack dispatch once; identifier conversion behind it is
+        # cached, so each distinct argument name is converted at most once.
+        visit = self.visit
+        return ", ".join([visit(arg) for arg in node.args])
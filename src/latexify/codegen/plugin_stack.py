@@ -10,9 +10,11 @@ from latexify.exceptions import LatexifyNotSupportedError
 
 class Stack(ast.NodeVisitor):
     _plugins: tuple[Plugin]
+    _dispatch: dict[type, tuple[tuple[Plugin, object], ...]]
 
     def __init__(self, *plugins: Plugin):
         self._plugins = plugins
+        self._dispatch = {}
         for plugin in plugins:
             if not isinstance(plugin, Plugin):
                 raise TypeError(f"Expected Plugin, got {type(plugin)}")
@@ -30,9 +32,20 @@ class Stack(ast.NodeVisitor):
         Returns:
             str: The LaTeX code.
         """
-        for plugin in self._plugins:
+        node_type = node.__class__
+        handlers = self._dispatch.get(node_type)
+        if handlers is None:
+            type_name = node_type.__name__
+            handlers = tuple(
+                (plugin, plugin._visit_methods[type_name])  # noqa: SLF001
+                for plugin in self._plugins
+                if type_name in plugin._visit_methods  # noqa: SLF001
+            )
+            self._dispatch[node_type] = handlers
+
+        for plugin, method in handlers:
             try:
-                return ast.NodeVisitor.visit(plugin, node)
+                return method(plugin, node)
             except NotImplementedError:
                 pass
 
@@ -2,18 +2,63 @@
 
 from __future__ import annotations
 
+import weakref
 from functools import partial
 from typing import TYPE_CHECKING, Any, overload
 
 from latexify.codegen.algorithmic_codegen import AlgorithmicCodegen, IPythonLatexifier
 from latexify.codegen.plugin import Plugin
 from latexify.exceptions import LatexifyError
-from latexify.generate_latex import get_latex
+from latexify.generate_latex import TRANSFORMER_ARG_NAMES, get_latex, transform_function
 from latexify.ipython_wrappers import LatexifyWrapper
 
 if TYPE_CHECKING:
     from collections.abc import Callable, Sequence
 
+# Rendered LaTeX keyed per function code object, then by frontend mode and
+# keyword arguments. Entries are evicted when the code object is collected.
+_latex_cache: dict[int, dict[tuple, Any]] = {}
+
+
+def _cache_key(mode: str, kwargs: dict[str, Any]) -> tuple | None:
+    """Builds a hashable cache key, or None if the call is not cacheable."""
+    if "to_file" in kwargs or kwargs.get("plugins"):
+        # File output is a side effect; plugin instances are not hashable.
+        return None
+    parts = []
+    for key, value in sorted(kwargs.items()):
+        if isinstance(value, set):
+            value = tuple(sorted(value))
+        elif isinstance(value, dict):
+            value = tuple(sorted(value.items()))
+        elif value is not None and not isinstance(value, (bool, int, str)):
+            return None
+        parts.append((key, value))
+    return (mode, *parts)
+
+
+def _cache_lookup(fn: Callable[..., Any], key: tuple | None) -> Any | None:
+    if key is None:
+        return None
+    code = getattr(fn, "__code__", None)
+    if code is None:
+        return None
+    per_code = _latex_cache.get(id(code))
+    return per_code.get(key) if per_code is not None else None
+
+
+def _cache_store(fn: Callable[..., Any], key: tuple | None, value: Any) -> None:
+    if key is None:
+        return
+    code = getattr(fn, "__code__", None)
+    if code is None:
+        return
+    per_code = _latex_cache.get(id(code))
+    if per_code is None:
+        per_code = _latex_cache[id(code)] = {}
+        weakref.finalize(code, _latex_cache.pop, id(code), None)
+    per_code[key] = value
+
 
 @overload
 def algorithmic(
@@ -72,19 +117,51 @@ def algorithmic(
         - Otherwise, returns the wrapper function with given settings.
     """
     if fn is not None:
-        try:
-            algpseudocode = get_latex(fn, AlgorithmicCodegen(), **kwargs)
-        except LatexifyError as e:
-            algpseudocode = _describe_error(e)
-
-        try:
-            latex = get_latex(fn, IPythonLatexifier(), **kwargs)
-        except LatexifyError as e:
-            latex = _describe_error(e)
-        else:
-            latex = f"$ {latex} $"
-
-        return LatexifyWrapper(fn, algpseudocode, latex)
+        key = _cache_key("algorithmic", kwargs)
+
+        # Both representations consume the same transformed tree, so parse and
+        # transform once and let the codegen passes share the result. Errors
+        # raised here surface through each thunk's own LatexifyError handler.
+        trees: list = []
+
+        def shared_tree():
+            if not trees:
+                trees.append(transform_function(fn, **{k: kwargs[k] for k in TRANSFORMER_ARG_NAMES if k in kwargs}))
+            return trees[0]
+
+        # Render lazily: a notebook cell typically requests only one of the
+        # two representations, so the other pass never runs. Each rendering
+        # is cached on its own sub-key.
+        def render_algpseudocode() -> str:
+            sub_key = None if key is None else (*key, "alg")
+            cached = _cache_lookup(fn, sub_key)
+            if cached is not None:
+                return cached
+            try:
+                latex = get_latex(fn, AlgorithmicCodegen(), tree=shared_tree(), **kwargs)
+            except LatexifyError as e:
+                latex = _describe_error(e)
+            _cache_store(fn, sub_key, latex)
+            return latex
+
+        def render_ipython_latex() -> str:
+            sub_key = None if key is None else (*key, "ipython")
+            cached = _cache_lookup(fn, sub_key)
+            if cached is not None:
+                return cached
+            try:
+                latex = f"$ {get_latex(fn, IPythonLatexifier(), tree=shared_tree(), **kwargs)} $"
+            except LatexifyError as e:
+                latex = _describe_error(e)
+            _cache_store(fn, sub_key, latex)
+            return latex
+
+        if kwargs.get("to_file"):
+            # File output is a decoration-time side effect; render eagerly so
+            # the file is written even if no representation is ever requested.
+            return LatexifyWrapper(fn, render_algpseudocode(), render_ipython_latex())
+
+        return LatexifyWrapper(fn, render_algpseudocode, render_ipython_latex)
 
     return partial(algorithmic, **kwargs)
 
@@ -147,12 +224,18 @@ def function(
         - Otherwise, returns the wrapper function with given settings.
     """
     if fn is not None:
+        key = _cache_key("function", kwargs)
+        cached = _cache_lookup(fn, key)
+        if cached is not None:
+            return LatexifyWrapper(fn, *cached)
+
         try:
             latex = get_latex(fn, **kwargs)
         except LatexifyError as e:
             s = latex = _describe_error(e)
         else:
             s, latex = latex, f"$$ \\displaystyle {latex} $$"
+        _cache_store(fn, key, (s, latex))
         return LatexifyWrapper(fn, s, latex)
 
     return partial(function, **kwargs)
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import ast
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
+from latexify.analyzers import preannotate_ranges
 from latexify.ast_utils import parse_function
 from latexify.codegen.function_codegen import FunctionCodegen
 from latexify.codegen.plugin_stack import _default_stack
@@ -19,6 +21,54 @@ if TYPE_CHECKING:
     from latexify.codegen.plugin import Plugin
 
 
+# Names of the get_latex arguments consumed by transform_function. Callers
+# holding a raw kwargs dict can use this to split off the transformer options.
+TRANSFORMER_ARG_NAMES = ("trim_prefixes", "replace_identifiers", "reduce_assignments", "expand_functions")
+
+
+def transform_function(
+    fn: Callable[..., Any],
+    /,
+    trim_prefixes: set[str] | None = None,
+    replace_identifiers: dict[str, str] | None = None,
+    reduce_assignments: bool = False,
+    expand_functions: set[str] | None = None,
+) -> ast.Module:
+    """Parses the given function and applies the configured transformer chain.
+
+    The returned tree is ready for codegen; codegen passes only annotate memo
+    attributes on nodes, so the same tree can be visited by several stacks.
+    """
+    tree = parse_function(fn)
+
+    # One walk up front collects the node types present, so transformers whose
+    # trigger nodes are absent can skip a full-tree pass of their own.
+    present_types = {type(node) for node in ast.walk(tree)}
+
+    transformers = []
+    if ast.AugAssign in present_types:
+        transformers.append(AugAssignReplacer())
+    if trim_prefixes:
+        transformers.append(PrefixTrimmer(trim_prefixes))
+    if replace_identifiers:
+        transformers.append(IdentifierReplacer(replace_identifiers))
+    if reduce_assignments:
+        if ast.Expr in present_types:
+            transformers.append(DocstringRemover())
+        # Always run the reducer: besides rewriting, it validates that the
+        # function body holds only nodes it supports, even without an Assign.
+        transformers.append(AssignmentReducer())
+    if expand_functions and ast.Call in present_types:
+        transformers.append(FunctionExpander(expand_functions))
+
+    for transformer in transformers:
+        tree = transformer.visit(tree)
+
+    # Annotate range(...) calls once so codegen passes need not re-analyze them.
+    preannotate_ranges(tree)
+    return tree
+
+
 def get_latex(
     fn: Callable[..., Any],
     /,
@@ -36,26 +86,25 @@ def get_latex(
     id_to_latex: dict[str, str] | None = None,
     plugins: Sequence[Plugin] | None = None,
     use_signature: bool = True,
+    # Keyword-only: inserting this positionally would shift every argument
+    # after it for existing positional callers.
+    *,
+    tree: ast.Module | None = None,
 ) -> str:
-    """Generate LaTeX code for the given function."""
-
-    tree = parse_function(fn)
+    """Generate LaTeX code for the given function.
 
-    transformers = [
-        t
-        for t in [
-            AugAssignReplacer(),
-            trim_prefixes and PrefixTrimmer(trim_prefixes),
-            replace_identifiers and IdentifierReplacer(replace_identifiers),
-            reduce_assignments and DocstringRemover(),
-            reduce_assignments and AssignmentReducer(),
-            expand_functions and FunctionExpander(expand_functions),
-        ]
-        if t
-    ]
+    If `tree` is given it must come from transform_function(fn, ...); the
+    transformer arguments are then ignored and codegen runs directly on it.
+    """
 
-    for transformer in transformers:
-        tree = transformer.visit(tree)
+    if tree is None:
+        tree = transform_function(
+            fn,
+            trim_prefixes=trim_prefixes,
+            replace_identifiers=replace_identifiers,
+            reduce_assignments=reduce_assignments,
+            expand_functions=expand_functions,
+        )
 
     stack = _default_stack(
         *(plugins or []),
@@ -7,13 +7,23 @@ if TYPE_CHECKING:
 
 
 class LatexifyWrapper:
-    """Object with LaTeX representation."""
+    """Object with LaTeX representation.
+
+    The string and LaTeX representations may be given as zero-argument
+    callables; they are then rendered on first access, so a wrapper whose
+    representation is never requested does not pay for codegen.
+    """
 
     _fn: Callable[..., Any]
-    _str: str
-    _latex: str
+    _str: str | Callable[[], str]
+    _latex: str | Callable[[], str]
 
-    def __init__(self, fn: Callable[..., Any], s: str, latex: str) -> None:
+    def __init__(
+        self,
+        fn: Callable[..., Any],
+        s: str | Callable[[], str],
+        latex: str | Callable[[], str],
+    ) -> None:
         self._fn = fn
         self._str = s
         self._latex = latex
@@ -38,11 +48,17 @@ class LatexifyWrapper:
         return self._fn(*args, **kwargs)
 
     def __str__(self) -> str:
-        return self._str
+        s = self._str
+        if not isinstance(s, str):
+            s = self._str = s()
+        return s
 
     def _repr_latex_(self) -> str:
         """IPython hook to display LaTeX visualization.
 
         See https://ipython.readthedocs.io/en/stable/config/integrating.html
         """
-        return self._latex
+        latex = self._latex
+        if not isinstance(latex, str):
+            latex = self._latex = latex()
+        return latex
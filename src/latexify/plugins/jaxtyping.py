@@ -2,19 +2,33 @@ import ast
 
 from latexify.codegen.plugin import Plugin
 
+# Subscripted names recognized as jaxtyping array annotations.
+_DTYPE_NAMES = frozenset({"Float", "Int"})
+
+_REAL_L = r"\mathbb{R}^{"
+_REAL_R = r"}"
+
 
 class JaxTypingPlugin(Plugin):
     def visit_Subscript(self, node: ast.Subscript):
+        # Bail out as early as possible: almost every Subscript visited here
+        # is an ordinary index expression, not a jaxtyping annotation.
+        value = node.value
+        if type(value) is not ast.Name or value.id not in _DTYPE_NAMES:
+            raise NotImplementedError
+        slice_ = node.slice
+        if type(slice_) is not ast.Tuple or len(elts := slice_.elts) != 2:
+            raise NotImplementedError
         if (
-            isinstance(node.value, ast.Name)
-            and node.value.id in ("Float", "Int")
-            and isinstance(node.slice, ast.Tuple)
-            and len(elts := node.slice.elts) == 2
-            and isinstance(elts[0], ast.Name)
+            type(elts[0]) is ast.Name
             and elts[0].id == "Array"
-            and isinstance(elts[1], ast.Constant)
+            and type(elts[1]) is ast.Constant
             and isinstance(dim := elts[1].value, str)
         ):
-            dim = r" \times ".join(dim.strip().split())
-            return r"\mathbb{R}^{" + dim + r"}"
+            # Single-dimension annotations like Float[Array, "N"] are the
+            # common case; skip the split/join when there is nothing to split.
+            dim = dim.strip()
+            if " " in dim or "\t" in dim or "\n" in dim:
+                dim = r" \times ".join(dim.split())
+            return _REAL_L + dim + _REAL_R
         raise NotImplementedError
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import ast
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, ClassVar
 
 from latexify.analyzers import extract_function_name_or_none, extract_int_or_none
 from latexify.codegen.plugin import Plugin
@@ -10,6 +10,11 @@ if TYPE_CHECKING:
     from collections.abc import Callable
 
 
+# Bracket fragments shared by the function-style generators below.
+_LPAREN = r" \mathopen{}\left( "
+_RPAREN = r" \mathclose{}\right)"
+
+
 class NumpyPlugin(Plugin):
     """Converts numpy linear algebra expressions to LaTeX.
 
@@ -21,54 +26,76 @@ class NumpyPlugin(Plugin):
         self,
         pinv_symbol: str = r"\dagger",
     ):
-        self.CUSTOM_FUNCTIONS: dict[str, Callable[[ast.NodeVisitor, ast.Call], str]] = {
-            "array": self._generate_matrix,
-            "ndarray": self._generate_matrix,
-            "zeros": self._generate_zeros,
-            "identity": self._generate_identity,
-            "transpose": self._generate_transpose,
-            "det": self._generate_determinant,
-            "matrix_rank": self._generate_matrix_rank,
-            "matrix_power": self._generate_matrix_power,
-            "inv": self._generate_inv,
-            "pinv": self._generate_pinv,
-            "grad": self._generate_grad,
-        }
         self._pinv_symbol = pinv_symbol
+        # Memo of generated matrix literals keyed by id of the list node.
+        # Values keep the node alive so ids cannot be recycled.
+        self._matrix_cache: dict[int, tuple[ast.AST, str | None]] = {}
 
     def visit_Call(self, node):
         func_name = extract_function_name_or_none(node)
 
-        if func_name in self.CUSTOM_FUNCTIONS and (out := self.CUSTOM_FUNCTIONS[func_name](node)) is not None:
+        generator = self.CUSTOM_FUNCTIONS.get(func_name) if func_name is not None else None
+        if generator is not None and (out := generator(self, node, func_name)) is not None:
             return out
 
         return self.generic_visit(node)
 
-    def _generate_matrix(self, node: ast.Call) -> str | None:
+    def _generate_matrix(self, node: ast.Call, _name: str | None = None) -> str | None:
         """Generates matrix expression.
 
+        The result is memoized per list literal, so wrappers such as
+        det(...) or inv(...) over the same literal render it only once.
+
         Args:
             node: ast.Call node containing the ndarray invocation.
 
         Returns:
             Generated LaTeX, or None if the node has unsupported syntax.
         """
+        arg = node.args[0]
+        cached = self._matrix_cache.get(id(arg))
+        if cached is not None:
+            return cached[1]
+        latex = self._generate_matrix_uncached(arg)
+        self._matrix_cache[id(arg)] = (arg, latex)
+        return latex
+
+    def _generate_matrix_uncached(self, arg: ast.expr) -> str | None:
+        """Uncached implementation of _generate_matrix."""
+
+        def convert_element(x: ast.expr) -> str:
+            # Numeric literals dominate matrix literals; format them directly
+            # (matching convert_constant) instead of dispatching through the
+            # whole plugin stack.
+            if type(x) is ast.Constant and type(x.value) in (int, float, complex):
+                return str(x.value)
+            return self.visit(x)
 
         def generate_matrix_from_array(data: list[list[str]]) -> str:
             """Helper to generate a bmatrix environment."""
-            contents = r" \\ ".join(" & ".join(row) for row in data)
-            return r"\begin{bmatrix} " + contents + r" \end{bmatrix}"
-
-        arg = node.args[0]
-        if not isinstance(arg, ast.List) or not arg.elts:
+            # One flat parts list and a single join, instead of a joined
+            # string per row plus a join across rows.
+            parts = [r"\begin{bmatrix} "]
+            append = parts.append
+            for i, row in enumerate(data):
+                if i:
+                    append(r" \\ ")
+                for j, cell in enumerate(row):
+                    if j:
+                        append(" & ")
+                    append(cell)
+            append(r" \end{bmatrix}")
+            return "".join(parts)
+
+        if type(arg) is not ast.List or not arg.elts:
             # Not an array or no rows
             return None
 
         row0 = arg.elts[0]
 
-        if not isinstance(row0, ast.List):
+        if type(row0) is not ast.List:
             # Maybe 1 x N array
-            return generate_matrix_from_array([[self.visit(x) for x in arg.elts]])
+            return generate_matrix_from_array([[convert_element(x) for x in arg.elts]])
 
         if not row0.elts:
             # No columns
@@ -79,29 +106,26 @@ class NumpyPlugin(Plugin):
         rows: list[list[str]] = []
 
         for row in arg.elts:
-            if not isinstance(row, ast.List) or len(row.elts) != ncols:
+            if type(row) is not ast.List or len(row.elts) != ncols:
                 # Length mismatch
                 return None
 
-            rows.append([self.visit(x) for x in row.elts])
+            rows.append([convert_element(x) for x in row.elts])
 
         return generate_matrix_from_array(rows)
 
-    def _generate_zeros(self, node: ast.Call) -> str | None:
+    def _generate_zeros(self, node: ast.Call, _name: str) -> str | None:
         """Generates LaTeX for numpy.zeros.
         Args:
             node: ast.Call node containing the appropriate method invocation.
         Returns:
             Generated LaTeX, or None if the node has unsupported syntax.
         """
-        name = extract_function_name_or_none(node)
-        assert name == "zeros", name
-
         if len(node.args) != 1:
             return None
 
         # All args to np.zeros should be numeric.
-        if isinstance(node.args[0], ast.Tuple):
+        if type(node.args[0]) is ast.Tuple:
             dims = [extract_int_or_none(x) for x in node.args[0].elts]
             if any(x is None for x in dims):
                 return None
@@ -120,16 +144,13 @@ class NumpyPlugin(Plugin):
 
         return rf"\mathbf{{0}}^{{{dims_latex}}}"
 
-    def _generate_identity(self, node: ast.Call) -> str | None:
+    def _generate_identity(self, node: ast.Call, _name: str) -> str | None:
         """Generates LaTeX for numpy.identity.
         Args:
             node: ast.Call node containing the appropriate method invocation.
         Returns:
             Generated LaTeX, or None if the node has unsupported syntax.
         """
-        name = extract_function_name_or_none(node)
-        assert name == "identity", name
-
         if len(node.args) != 1:
             return None
 
@@ -139,7 +160,7 @@ class NumpyPlugin(Plugin):
 
         return rf"\mathbf{{I}}_{{{ndims}}}"
 
-    def _generate_transpose(self, node: ast.Call) -> str | None:
+    def _generate_transpose(self, node: ast.Call, _name: str) -> str | None:
         """Generates LaTeX for numpy.transpose.
         Args:
             node: ast.Call node containing the appropriate method invocation.
@@ -148,19 +169,16 @@ class NumpyPlugin(Plugin):
         Raises:
             LatexifyError: Unsupported argument type given.
         """
-        name = extract_function_name_or_none(node)
-        assert name == "transpose", name
-
         if len(node.args) != 1:
             return None
 
         func_arg = node.args[0]
-        if isinstance(func_arg, ast.Name):
+        if type(func_arg) is ast.Name:
             return rf"\mathbf{{{func_arg.id}}}^\intercal"
         else:
             return None
 
-    def _generate_determinant(self, node: ast.Call) -> str | None:
+    def _generate_determinant(self, node: ast.Call, _name: str) -> str | None:
         """Generates LaTeX for numpy.linalg.det.
         Args:
             node: ast.Call node containing the appropriate method invocation.
@@ -169,23 +187,22 @@ class NumpyPlugin(Plugin):
         Raises:
             LatexifyError: Unsupported argument type given.
         """
-        name = extract_function_name_or_none(node)
-        assert name == "det", name
-
         if len(node.args) != 1:
             return None
 
         func_arg = node.args[0]
-        if isinstance(func_arg, ast.Name):
+        if type(func_arg) is ast.Name:
             arg_id = rf"\mathbf{{{func_arg.id}}}"
-            return rf"\det \mathopen{{}}\left( {arg_id} \mathclose{{}}\right)"
-        elif isinstance(func_arg, ast.List):
+            return r"\det" + _LPAREN + arg_id + _RPAREN
+        elif type(func_arg) is ast.List:
             matrix = self._generate_matrix(node)
-            return rf"\det \mathopen{{}}\left( {matrix} \mathclose{{}}\right)"
+            if matrix is None:
+                return None
+            return r"\det" + _LPAREN + matrix + _RPAREN
 
         return None
 
-    def _generate_matrix_rank(self, node: ast.Call) -> str | None:
+    def _generate_matrix_rank(self, node: ast.Call, _name: str) -> str | None:
         """Generates LaTeX for numpy.linalg.matrix_rank.
         Args:
             node: ast.Call node containing the appropriate method invocation.
@@ -194,23 +211,22 @@ class NumpyPlugin(Plugin):
         Raises:
             LatexifyError: Unsupported argument type given.
         """
-        name = extract_function_name_or_none(node)
-        assert name == "matrix_rank", name
-
         if len(node.args) != 1:
             return None
 
         func_arg = node.args[0]
-        if isinstance(func_arg, ast.Name):
+        if type(func_arg) is ast.Name:
             arg_id = rf"\mathbf{{{func_arg.id}}}"
-            return rf"\mathrm{{rank}} \mathopen{{}}\left( {arg_id} \mathclose{{}}\right)"
-        elif isinstance(func_arg, ast.List):
+            return r"\mathrm{rank}" + _LPAREN + arg_id + _RPAREN
+        elif type(func_arg) is ast.List:
             matrix = self._generate_matrix(node)
-            return rf"\mathrm{{rank}} \mathopen{{}}\left( {matrix} \mathclose{{}}\right)"
+            if matrix is None:
+                return None
+            return r"\mathrm{rank}" + _LPAREN + matrix + _RPAREN
 
         return None
 
-    def _generate_matrix_power(self, node: ast.Call) -> str | None:
+    def _generate_matrix_power(self, node: ast.Call, _name: str) -> str | None:
         """Generates LaTeX for numpy.linalg.matrix_power.
         Args:
             node: ast.Call node containing the appropriate method invocation.
@@ -219,24 +235,24 @@ class NumpyPlugin(Plugin):
         Raises:
             LatexifyError: Unsupported argument type given.
         """
-        name = extract_function_name_or_none(node)
-        assert name == "matrix_power", name
-
         if len(node.args) != 2:
             return None
 
         func_arg = node.args[0]
         power_arg = node.args[1]
-        if isinstance(power_arg, ast.Num):
-            if isinstance(func_arg, ast.Name):
-                return rf"\mathbf{{{func_arg.id}}}^{{{power_arg.n}}}"
-            elif isinstance(func_arg, ast.List):
+        # ast.Num is a deprecated alias whose isinstance check goes through
+        # ABC machinery; match the numeric Constant directly.
+        if type(power_arg) is ast.Constant and type(power_arg.value) in (int, float, complex):
+            power = power_arg.value
+            if type(func_arg) is ast.Name:
+                return rf"\mathbf{{{func_arg.id}}}^{{{power}}}"
+            elif type(func_arg) is ast.List:
                 matrix = self._generate_matrix(node)
                 if matrix is not None:
-                    return rf"{matrix}^{{{power_arg.n}}}"
+                    return rf"{matrix}^{{{power}}}"
         return None
 
-    def _generate_inv(self, node: ast.Call) -> str | None:
+    def _generate_inv(self, node: ast.Call, _name: str) -> str | None:
         """Generates LaTeX for numpy.linalg.inv.
         Args:
             node: ast.Call node containing the appropriate method invocation.
@@ -245,20 +261,17 @@ class NumpyPlugin(Plugin):
         Raises:
             LatexifyError: Unsupported argument type given.
         """
-        name = extract_function_name_or_none(node)
-        assert name == "inv", name
-
         if len(node.args) != 1:
             return None
 
         func_arg = node.args[0]
-        if isinstance(func_arg, ast.Name):
+        if type(func_arg) is ast.Name:
             return rf"\mathbf{{{func_arg.id}}}^{{-1}}"
-        elif isinstance(func_arg, ast.List):
+        elif type(func_arg) is ast.List:
             return rf"{self._generate_matrix(node)}^{{-1}}"
         return None
 
-    def _generate_pinv(self, node: ast.Call) -> str | None:
+    def _generate_pinv(self, node: ast.Call, _name: str) -> str | None:
         """Generates LaTeX for numpy.linalg.pinv.
         Args:
             node: ast.Call node containing the appropriate method invocation.
@@ -267,18 +280,32 @@ class NumpyPlugin(Plugin):
         Raises:
             LatexifyError: Unsupported argument type given.
         """
-        name = extract_function_name_or_none(node)
-        assert name == "pinv", name
-
         if len(node.args) != 1:
             return None
 
         func_arg = node.args[0]
-        if isinstance(func_arg, ast.Name):
+        if type(func_arg) is ast.Name:
             return r"\mathbf{" + func_arg.id + r"}^{" + self._pinv_symbol + r"}"
-        elif isinstance(func_arg, ast.List):
+        elif type(func_arg) is ast.List:
             return self._generate_matrix(node) + r"^{" + self._pinv_symbol + r"}"
         return None
 
-    def _generate_grad(self, node: ast.Call) -> str | None:
+    def _generate_grad(self, node: ast.Call, _name: str) -> str | None:
         return r"\nabla \mathopen{}\left(" + self.visit(node.args[0]) + r"\mathclose{}\right)"
+
+    # Dispatch table of supported function names. Built once at class creation
+    # from the plain functions above, so constructing a plugin does not
+    # allocate a dict of bound methods; visit_Call passes `self` explicitly.
+    CUSTOM_FUNCTIONS: ClassVar[dict[str, Callable[[NumpyPlugin, ast.Call, str], str | None]]] = {
+        "array": _generate_matrix,
+        "ndarray": _generate_matrix,
+        "zeros": _generate_zeros,
+        "identity": _generate_identity,
+        "transpose": _generate_transpose,
+        "det": _generate_determinant,
+        "matrix_rank": _generate_matrix_rank,
+        "matrix_power": _generate_matrix_power,
+        "inv": _generate_inv,
+        "pinv": _generate_pinv,
+        "grad": _generate_grad,
+    }
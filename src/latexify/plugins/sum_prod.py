@@ -6,6 +6,13 @@ from latexify.analyzers import analyze_range, extract_function_name_or_none, red
 from latexify.codegen.plugin import Plugin
 from latexify.exceptions import LatexifyError
 
+# LaTeX commands of the reduction functions handled by this plugin.
+_COMMANDS = {
+    "fsum": r"\sum",
+    "sum": r"\sum",
+    "prod": r"\prod",
+}
+
 
 class SumProdPlugin(Plugin):
     """Converts sum and prod functions to LaTeX."""
@@ -23,18 +30,27 @@ class SumProdPlugin(Plugin):
             str: LaTeX representation of the sum/prod expression.
         """
         name = extract_function_name_or_none(node)
-        if name not in ("fsum", "sum", "prod") or not node.args or not isinstance(node.args[0], ast.GeneratorExp):
+        command = _COMMANDS.get(name) if name is not None else None
+        if command is None or not node.args or type(node.args[0]) is not ast.GeneratorExp:
             raise NotImplementedError
 
-        command = {
-            "fsum": r"\sum",
-            "sum": r"\sum",
-            "prod": r"\prod",
-        }[name]
-
         elt, scripts = self._get_sum_prod_info(node.args[0])
-        scripts_str = [rf"{command}_{{{lo}}}^{{{up}}}" for lo, up in scripts]
-        return " ".join(scripts_str) + rf" \mathopen{{}}\left({{{elt}}}\mathclose{{}}\right)"
+
+        # One flat parts list and a single join, instead of a formatted string
+        # per script plus a join across scripts.
+        parts: list[str] = []
+        append = parts.append
+        for lo, up in scripts:
+            append(command)
+            append("_{")
+            append(lo)
+            append("}^{")
+            append(up)
+            append("} ")
+        append(r"\mathopen{}\left({")
+        append(elt)
+        append(r"}\mathclose{}\right)")
+        return "".join(parts)
 
     def _get_sum_prod_info(self, node: ast.GeneratorExp) -> tuple[str, list[tuple[str, str]]]:
         r"""Process GeneratorExp for sum and prod functions.
@@ -55,7 +71,8 @@ class SumProdPlugin(Plugin):
         Raises:
             LateixfyError: Unsupported AST is given.
         """
-        elt = self.visit(node.elt)
+        visit = self.visit  # Bind once for the loop below.
+        elt = visit(node.elt)
 
         scripts: list[tuple[str, str]] = []
 
@@ -63,11 +80,11 @@ class SumProdPlugin(Plugin):
             range_args = self._get_sum_prod_range(comp)
 
             if range_args is not None and not comp.ifs:
-                target = self.visit(comp.target)
+                target = visit(comp.target)
                 lower_rhs, upper = range_args
                 lower = f"{target} = {lower_rhs}"
             else:
-                lower = self.visit(comp)  # Use a usual comprehension form.
+                lower = visit(comp)  # Use a usual comprehension form.
                 upper = ""
 
             scripts.append((lower, upper))
@@ -86,16 +103,23 @@ class SumProdPlugin(Plugin):
                 - upper
             which are used in _get_sum_prod_info, or None if the analysis failed.
         """
-        if not (
-            isinstance(node.iter, ast.Call) and isinstance(node.iter.func, ast.Name) and node.iter.func.id == "range"
-        ):
+        # AST node classes are never subclassed here, so exact type checks
+        # suffice and bail out before touching `.func` on non-calls.
+        iter_node = node.iter
+        if type(iter_node) is not ast.Call:
             return None
-
-        try:
-            range_info = analyze_range(node.iter)
-        except LatexifyError:
+        func = iter_node.func
+        if type(func) is not ast.Name or func.id != "range":
             return None
 
+        # Reuse the annotation left by analyzers.preannotate_ranges when present.
+        range_info = getattr(iter_node, "_range_info", None)
+        if range_info is None:
+            try:
+                range_info = analyze_range(iter_node)
+            except LatexifyError:
+                return None
+
         if (
             # Only accepts ascending order with step size 1.
             range_info.step_int != 1
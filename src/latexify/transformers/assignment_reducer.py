@@ -6,9 +6,10 @@ import ast
 from typing import Any
 
 from latexify import exceptions
+from latexify.ast_utils import CachedDispatchTransformer
 
 
-class AssignmentReducer(ast.NodeTransformer):
+class AssignmentReducer(CachedDispatchTransformer):
     """NodeTransformer to reduce assigned expressions.
 
     This class replaces a functions with multiple assignments to a function with only
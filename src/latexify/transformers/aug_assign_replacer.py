@@ -4,8 +4,10 @@ from __future__ import annotations
 
 import ast
 
+from latexify.ast_utils import CachedDispatchTransformer
 
-class AugAssignReplacer(ast.NodeTransformer):
+
+class AugAssignReplacer(CachedDispatchTransformer):
     """NodeTransformer to replace AugAssign (e.g. `x += 3`) with the corresponding Assign.
 
     AugAssign(target, op, value) => Assign([target], BinOp(target, op, value))
@@ -7,7 +7,7 @@ import ast
 from latexify import ast_utils
 
 
-class DocstringRemover(ast.NodeTransformer):
+class DocstringRemover(ast_utils.CachedDispatchTransformer):
     """NodeTransformer to remove all docstrings.
 
     Docstrings here are detected as Expr nodes with a single string constant.
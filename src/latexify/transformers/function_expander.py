@@ -12,7 +12,7 @@ if TYPE_CHECKING:
 
 
 # TODO(ZibingZhang): handle mutually recursive function expansions
-class FunctionExpander(ast.NodeTransformer):
+class FunctionExpander(ast_utils.CachedDispatchTransformer):
     """NodeTransformer to expand functions.
 
     This class replaces function calls with an expanded form.
@@ -3,13 +3,24 @@
 from __future__ import annotations
 
 import ast
+import functools
 import keyword
 
 from latexify.analyzers import analyze_attribute
-from latexify.ast_utils import make_attribute_nested
+from latexify.ast_utils import CachedDispatchTransformer, make_attribute_nested
 
 
-class IdentifierReplacer(ast.NodeTransformer):
+@functools.lru_cache(maxsize=1024)
+def _is_valid_identifier(name: str) -> bool:
+    """Cached validity check for (possibly dotted) identifier names.
+
+    Decorated mappings repeat the same names across replacer constructions,
+    so each distinct name is validated at most once per process.
+    """
+    return not keyword.iskeyword(name) and all(str.isidentifier(part) for part in name.split("."))
+
+
+class IdentifierReplacer(CachedDispatchTransformer):
     """NodeTransformer to replace identifier names.
 
     This class defines a rule to replace identifiers in AST with the specified new identifiers.
@@ -34,45 +45,49 @@ class IdentifierReplacer(ast.NodeTransformer):
     """
 
     def __init__(self, mapping: dict[str, str]):
-        self._mapping = mapping
-
         for k, v in mapping.items():
             self._check_valid(k)
             self._check_valid(v)
 
-    def _replace(self, name: str, allow_attribute: bool = False) -> str:
-        replaced = self._mapping.get(name, name)
-        if not allow_attribute and "." in replaced:
+        # Replacements pre-split on periods, so visits neither scan for "."
+        # nor re-split the same replacement on every occurrence. Attribute
+        # chains are looked up by the parts tuple analyze_attribute returns,
+        # which avoids joining the chain into a dotted string per visit.
+        self._mapping_parts = {k: tuple(v.split(".")) for k, v in mapping.items()}
+        self._mapping_by_tuple = {tuple(k.split(".")): v for k, v in self._mapping_parts.items()}
+
+    def _replace(self, name: str) -> str:
+        """Replaces a name in a position where dotted replacements cannot go."""
+        parts = self._mapping_parts.get(name)
+        if parts is None or len(parts) > 1:
             return name
-        return replaced
+        return parts[0]
 
     def _check_valid(self, name: str) -> None:
         """Check if the name is a valid identifier."""
-        if keyword.iskeyword(name) or any(not str.isidentifier(part) for part in name.split(".")):
+        if not _is_valid_identifier(name):
             raise ValueError(f"'{name}' is not an identifier name.")
 
     def visit_arg(self, node: ast.arg):
-        return ast.arg(
-            arg=self._replace(node.arg),
-            annotation=node.annotation,
-            type_comment=node.type_comment,
-        )
-
-    def visit_Name(self, node: ast.Name) -> ast.Name:
-        replaced = self._replace(node.id, allow_attribute=True)
-        return make_attribute_nested(replaced.split("."))
-
-    def visit_Attribute(self, node: ast.Attribute):
-        expanded = ".".join(analyze_attribute(node))
-        name = self._replace(expanded, allow_attribute=True)
-        return make_attribute_nested(name.split("."))
+        node.arg = self._replace(node.arg)
+        return node
+
+    def visit_Name(self, node: ast.Name) -> ast.expr:
+        parts = self._mapping_parts.get(node.id)
+        if parts is None:
+            return node
+        if len(parts) == 1:
+            node.id = parts[0]
+            return node
+        return make_attribute_nested(parts)
+
+    def visit_Attribute(self, node: ast.Attribute) -> ast.expr:
+        parts = self._mapping_by_tuple.get(analyze_attribute(node))
+        if parts is None:
+            return node
+        return make_attribute_nested(parts)
 
     def visit_FunctionDef(self, node: ast.FunctionDef):
-        replaced = self.generic_visit(node)
-        return ast.FunctionDef(
-            name=self._replace(node.name),
-            args=replaced.args,
-            body=replaced.body,
-            decorator_list=replaced.decorator_list,
-            returns=replaced.returns,
-        )
+        self.generic_visit(node)
+        node.name = self._replace(node.name)
+        return node
@@ -11,7 +11,7 @@ from latexify.analyzers import analyze_attribute
 _PREFIX_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)*$")
 
 
-class PrefixTrimmer(ast.NodeTransformer):
+class PrefixTrimmer(ast_utils.CachedDispatchTransformer):
     """NodeTransformer to trim unnecessary prefixes.
 
     This class investigates all Attribute subtrees, and replace them if the prefix of
@@ -34,28 +34,33 @@ class PrefixTrimmer(ast.NodeTransformer):
             return sqrt(x)
     """
 
-    _prefixes: list[tuple[str, ...]]
+    # Prefix tuples indexed by their first token, longest first, so a visit
+    # only scans candidates that can possibly match.
+    _prefix_index: dict[str, list[tuple[str, ...]]]
 
     def __init__(self, prefixes: set[str]) -> None:
         for p in prefixes:
             if not _PREFIX_PATTERN.match(p):
                 raise ValueError(f"Invalid prefix: {p}")
 
-        self._prefixes = [tuple(p.split(".")) for p in prefixes]
+        self._prefix_index = {}
+        for p in prefixes:
+            parts = tuple(p.split("."))
+            self._prefix_index.setdefault(parts[0], []).append(parts)
+        for candidates in self._prefix_index.values():
+            candidates.sort(key=len, reverse=True)
 
     def visit_Attribute(self, node: ast.Attribute) -> ast.expr:
         """Visit an Attribute node."""
         prefix = analyze_attribute(node.value)
 
-        # Performs leftmost longest match.
-        # NOTE(odashi):
-        # This implementation is very naive, but would work efficiently as long as the
-        # number of patterns is small.
+        # Performs leftmost longest match: candidates are sorted longest
+        # first, so the first hit wins.
         matched_length = 0
 
-        for p in self._prefixes:
-            length = min(len(p), len(prefix))
-            if prefix[:length] == p and length > matched_length:
-                matched_length = length
+        for p in self._prefix_index.get(prefix[0], ()):
+            if len(p) <= len(prefix) and prefix[: len(p)] == p:
+                matched_length = len(p)
+                break
 
         return ast_utils.make_attribute_nested(prefix[matched_length:] + (node.attr,))
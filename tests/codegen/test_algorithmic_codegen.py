@@ -272,6 +272,25 @@ def test_visit_while_with_else() -> None:
         visitor.visit(node)
 
 
+def test_visitor_reusable_after_unsupported_condition() -> None:
+    # A failing condition visit inside a block must release the shared line
+    # buffer, or every later visit on the same instance returns the internal
+    # in-buffer sentinel.
+    node = ast.parse("if {1: 2}:\n    x = 1").body[0]
+    assert isinstance(node, ast.If)
+    with pytest.raises(exceptions.LatexifyNotSupportedError):
+        visitor.visit(node)
+    assert_latex_equal(
+        "while x < y: x = x + 1",
+        ast.While,
+        r"""
+        \While{$x < y$}
+            \State $x \gets x + 1$
+        \EndWhile
+        """,
+    )
+
+
 def test_visit_pass() -> None:
     assert_latex_equal("pass", ast.Pass, r"\State $\mathbf{pass}$")
 
@@ -156,6 +156,15 @@ def test_transpose_unsupported(code: str, latex: str) -> None:
         # Unsupported
         ("det()", r"\mathrm{det} \mathopen{}\left( \mathclose{}\right)"),
         ("det(2)", r"\mathrm{det} \mathopen{}\left( 2 \mathclose{}\right)"),
+        (
+            "det([])",
+            r"\mathrm{det} \mathopen{}\left( \mathopen{}\left[  \mathclose{}\right] \mathclose{}\right)",
+        ),
+        (
+            "det([[1, 2], [3]])",
+            r"\mathrm{det} \mathopen{}\left( \mathopen{}\left[ \mathopen{}\left[ 1, 2 \mathclose{}\right], "
+            r"\mathopen{}\left[ 3 \mathclose{}\right] \mathclose{}\right] \mathclose{}\right)",
+        ),
         (
             "det(a, (1, 0))",
             r"\mathrm{det} \mathopen{}\left( a, " r"\mathopen{}\left( 1, 0 \mathclose{}\right) \mathclose{}\right)",
@@ -195,6 +204,10 @@ def test_determinant(code: str, latex: str) -> None:
             "matrix_rank(2)",
             r"\mathrm{matrix\_rank} \mathopen{}\left( 2 \mathclose{}\right)",
         ),
+        (
+            "matrix_rank([])",
+            r"\mathrm{matrix\_rank} \mathopen{}\left( \mathopen{}\left[  \mathclose{}\right] \mathclose{}\right)",
+        ),
         (
             "matrix_rank(a, (1, 0))",
             r"\mathrm{matrix\_rank} \mathopen{}\left( a, "
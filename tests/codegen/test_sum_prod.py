@@ -43,9 +43,9 @@ check_function_sum_prod = partial(check_function, plugins=[SumProdPlugin()])
         ),
     ],
 )
-def test_iterables(src_suffix: str, dest_suffix: str) -> None:
-    for src_fn, dest_fn in [("fsum", r"\sum"), ("sum", r"\sum"), ("prod", r"\prod")]:
-        assert_expr_equal(src_fn + src_suffix, ast.Call, dest_fn + dest_suffix)
+@pytest.mark.parametrize(("src_fn", "dest_fn"), [("fsum", r"\sum"), ("sum", r"\sum"), ("prod", r"\prod")])
+def test_iterables(src_suffix: str, dest_suffix: str, src_fn: str, dest_fn: str) -> None:
+    assert_expr_equal(src_fn + src_suffix, ast.Call, dest_fn + dest_suffix)
 
 
 @pytest.mark.parametrize(
@@ -128,9 +128,9 @@ def test_iterables(src_suffix: str, dest_suffix: str) -> None:
         ),
     ],
 )
-def test_ranges(src_suffix: str, dest_suffix: str) -> None:
-    for src_fn, dest_fn in [("fsum", r"\sum"), ("sum", r"\sum"), ("prod", r"\prod")]:
-        assert_expr_equal(src_fn + src_suffix, ast.Call, dest_fn + dest_suffix)
+@pytest.mark.parametrize(("src_fn", "dest_fn"), [("fsum", r"\sum"), ("sum", r"\sum"), ("prod", r"\prod")])
+def test_ranges(src_suffix: str, dest_suffix: str, src_fn: str, dest_fn: str) -> None:
+    assert_expr_equal(src_fn + src_suffix, ast.Call, dest_fn + dest_suffix)
 
 
 @pytest.mark.parametrize(
@@ -188,9 +188,9 @@ def test_visit_call_sum_prod_multiple_comprehension(code: str, latex: str) -> No
         ),
     ],
 )
-def test_visit_call_sum_prod_with_if(src_suffix: str, dest_suffix: str) -> None:
-    for src_fn, dest_fn in [("sum", r"\sum"), ("prod", r"\prod")]:
-        assert_expr_equal(src_fn + src_suffix, ast.Call, dest_fn + dest_suffix)
+@pytest.mark.parametrize(("src_fn", "dest_fn"), [("sum", r"\sum"), ("prod", r"\prod")])
+def test_visit_call_sum_prod_with_if(src_suffix: str, dest_suffix: str, src_fn: str, dest_fn: str) -> None:
+    assert_expr_equal(src_fn + src_suffix, ast.Call, dest_fn + dest_suffix)
 
 
 def test_sum_with_limit_1arg() -> None:
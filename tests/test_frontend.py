@@ -4,8 +4,13 @@
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 from latexify import frontend
 
+if TYPE_CHECKING:
+    from pathlib import Path
+
 
 def test_function() -> None:
     def f(x):
@@ -69,3 +74,74 @@ def test_expression() -> None:
     latexified = frontend.expression(f, use_signature=True)
     assert str(latexified) == latex_with_flag
     assert latexified._repr_latex_() == rf"$$ \displaystyle {latex_with_flag} $$"
+
+
+def test_function_cache_distinguishes_kwargs() -> None:
+    def f(x):
+        return x
+
+    assert str(frontend.function(f)) == r"f(x) = x"
+
+    # The rendering is now cached for these kwargs...
+    assert frontend._cache_lookup(f, frontend._cache_key("function", {})) is not None
+
+    # ...and a call with different kwargs must not reuse it.
+    assert str(frontend.function(f, use_signature=False)) == "x"
+    assert str(frontend.function(f)) == r"f(x) = x"
+
+
+def test_function_cache_snapshots_dict_arguments() -> None:
+    def f(x):
+        return x
+
+    mapping = {"x": "y"}
+    assert str(frontend.function(f, replace_identifiers=mapping, use_signature=False)) == "y"
+
+    # Mutating the caller's dict afterwards must yield a fresh rendering, not
+    # the entry cached for the old contents.
+    mapping["x"] = "z"
+    assert str(frontend.function(f, replace_identifiers=mapping, use_signature=False)) == "z"
+
+
+def test_function_to_file(tmp_path: Path) -> None:
+    def f(x):
+        return x
+
+    path = tmp_path / "f.tex"
+    latexified = frontend.function(f, to_file=str(path))
+    assert path.read_text() == str(latexified) == r"f(x) = x"
+
+
+def test_algorithmic_renders_lazily() -> None:
+    def f(x):
+        return x
+
+    latexified = frontend.algorithmic(f)
+
+    # Nothing is rendered until a representation is requested.
+    assert not isinstance(latexified._str, str)
+    assert not isinstance(latexified._latex, str)
+
+    expected = "\n".join(
+        [
+            r"\begin{algorithmic}",
+            r"    \Function{f}{$x$}",
+            r"        \State \Return $x$",
+            r"    \EndFunction",
+            r"\end{algorithmic}",
+        ]
+    )
+    assert str(latexified) == expected
+    assert isinstance(latexified._str, str)
+
+
+def test_algorithmic_to_file_renders_eagerly(tmp_path: Path) -> None:
+    def f(x):
+        return x
+
+    path = tmp_path / "f.tex"
+    latexified = frontend.algorithmic(f, to_file=str(path))
+
+    # The file is written at decoration time, before any representation is
+    # requested; the last rendering pass wins.
+    assert latexified._repr_latex_() == f"$ {path.read_text()} $"
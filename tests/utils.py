@@ -3,19 +3,17 @@
 from __future__ import annotations
 
 import ast
-import functools
 import sys
 import textwrap
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING
 
+import pytest
 from latexify.ast_utils import parse_expr
 from latexify.codegen.plugin_stack import _default_stack
 from latexify.plugins.numpy import NumpyPlugin
 from latexify.plugins.sum_prod import SumProdPlugin
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
-
     from latexify.codegen.plugin import Plugin
 
 
@@ -35,50 +33,51 @@ def assert_latex_equal(latexifier: Plugin, code: str, tp: type[ast.AST], latex:
     assert generated == textwrap.dedent(latex).strip(), generated
 
 
-def require_at_least(
-    minor: int,
-) -> Callable[[Callable[..., None]], Callable[..., None]]:
+def require_at_least(minor: int) -> pytest.MarkDecorator:
     """Require the minimum minor version of Python 3 to run the test.
 
     Args:
         minor: Minimum minor version (inclusive) that the test case supports.
 
     Returns:
-        A decorator function to wrap the test case function.
+        A skipif mark, evaluated once at collection; gated tests are reported
+        as skipped instead of silently passing.
     """
+    return pytest.mark.skipif(
+        sys.version_info < (3, minor),
+        reason=f"Requires Python>=3.{minor}",
+    )
 
-    def decorator(fn: Callable[..., None]) -> Callable[..., None]:
-        @functools.wraps(fn)
-        def wrapper(*args, **kwargs):
-            if sys.version_info >= (3, minor):
-                fn(*args, **kwargs)
-
-        return wrapper
-
-    return decorator
 
-
-def require_at_most(
-    minor: int,
-) -> Callable[[Callable[..., None]], Callable[..., None]]:
+def require_at_most(minor: int) -> pytest.MarkDecorator:
     """Require the maximum minor version of Python 3 to run the test.
 
     Args:
         minor: Maximum minor version (inclusive) that the test case supports.
 
     Returns:
-        A decorator function to wrap the test case function.
+        A skipif mark, evaluated once at collection; gated tests are reported
+        as skipped instead of silently passing.
     """
+    return pytest.mark.skipif(
+        sys.version_info.minor > minor,
+        reason=f"Requires Python<=3.{minor}",
+    )
+
+
+_MISSING = object()
 
-    def decorator(fn: Callable[..., None]) -> Callable[..., None]:
-        @functools.wraps(fn)
-        def wrapper(*args, **kwargs):
-            if sys.version_info.minor <= minor:
-                fn(*args, **kwargs)
+# Location/bookkeeping attributes ignored by ast_equal.
+_IGNORED_AST_ATTRS = frozenset({"col_offset", "end_col_offset", "end_lineno", "kind", "lineno"})
 
-        return wrapper
+# Version check resolved once: ast.dump grew `indent` in 3.9.
+if sys.version_info >= (3, 9):
 
-    return decorator
+    def _dump(node: ast.AST) -> str:
+        return ast.dump(node, indent=4)
+
+else:
+    _dump = ast.dump
 
 
 def ast_equal(observed: ast.AST, expected: ast.AST) -> bool:
@@ -95,27 +94,45 @@ def ast_equal(observed: ast.AST, expected: ast.AST) -> bool:
     Returns:
         True if observed and expected represent the same AST, False otherwise.
     """
-    try:
-        assert type(observed) is type(expected)
-
-        for k, ve in vars(expected).items():
-            if k in {"col_offset", "end_col_offset", "end_lineno", "kind", "lineno"}:
+    # Iterative traversal: a mismatch returns immediately instead of raising
+    # an AssertionError through one frame per ancestor node.
+    stack: list[tuple[object, object]] = [(observed, expected)]
+
+    while stack:
+        o, e = stack.pop()
+
+        # Shared subtrees (e.g. nodes reused by the transformers) are equal
+        # by identity without a field walk.
+        if o is e:
+            continue
+
+        if type(o) is not type(e):
+            return False
+
+        if not isinstance(e, ast.AST):
+            # Non-AST list element (e.g. identifier strings).
+            if o != e:
+                return False
+            continue
+
+        # vars() is deliberate: expected trees are built by hand with only the
+        # fields under test, and unset fields must stay uncompared.
+        for k, ve in vars(e).items():
+            if k in _IGNORED_AST_ATTRS:
                 continue
 
-            vo = getattr(observed, k)  # May cause AttributeError.
+            vo = getattr(o, k, _MISSING)
+            if vo is _MISSING:
+                return False
 
             if isinstance(ve, ast.AST):
-                assert ast_equal(cast(ast.AST, vo), ve)
+                stack.append((vo, ve))
             elif isinstance(ve, list):
-                vo = cast(list, vo)
-                assert len(vo) == len(ve)
-                assert all(ast_equal(cast(ast.AST, co), cast(ast.AST, ce)) for co, ce in zip(vo, ve))
-            else:
-                assert type(vo) is type(ve)
-                assert vo == ve
-
-    except (AssertionError, AttributeError):
-        return False
+                if type(vo) is not list or len(vo) != len(ve):
+                    return False
+                stack.extend(zip(vo, ve))
+            elif type(vo) is not type(ve) or vo != ve:
+                return False
 
     return True
 
@@ -130,15 +147,8 @@ def assert_ast_equal(observed: ast.AST, expected: ast.AST) -> None:
     Raises:
         AssertionError: observed and expected represent different ASTs.
     """
-    if sys.version_info >= (3, 9):
-        assert ast_equal(observed, expected), f"""\
-AST does not match.
-observed={ast.dump(observed, indent=4)}
-expected={ast.dump(expected, indent=4)}
-"""
-    else:
-        assert ast_equal(observed, expected), f"""\
+    assert ast_equal(observed, expected), f"""\
 AST does not match.
-observed={ast.dump(observed)}
-expected={ast.dump(expected)}
+observed={_dump(observed)}
+expected={_dump(expected)}
 """